@@ -5,14 +5,16 @@ __author__ = """Elias Dabbas"""
 __email__ = 'eliasdabbas@gmail.com'
 __version__ = '0.7.3'
 
-from advertools.ad_create import ad_create
-from advertools.ad_from_string import ad_from_string
+from advertools.ad_create import ad_create, ad_create_batch
+from advertools.ad_from_string import ad_from_string, ads_from_strings
+from advertools.doc_term_matrix import doc_term_matrix
 from advertools.extract import *
 from advertools.kw_generate import *
+from advertools.kw_match import *
 from advertools.regex import *
 from advertools.stopwords import stopwords
-from advertools.url_builders import url_utm_ga
-from advertools.word_frequency import word_frequency
-from advertools.word_tokenize import word_tokenize
+from advertools.url_builders import url_utm_ga, url_utm_ga_batch, url_utm_parse
+from advertools.word_frequency import word_frequency, word_frequency_external
+from advertools.word_tokenize import TokenizedCorpus, word_tokenize
 from . import twitter
 from .serp import *
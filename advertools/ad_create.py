@@ -1,5 +1,8 @@
 import string
 
+import numpy as np
+import pandas as pd
+
 
 def ad_create(template, replacements, fallback, max_len=30, capitalize=True):
     """Insert each of the replacement strings in its place within template.
@@ -34,14 +37,119 @@ def ad_create(template, replacements, fallback, max_len=30, capitalize=True):
     File "<input>", line 26, in ad_create
     ValueError: template + fallback should be <= 20 chars
     """
-    if len(template.format(fallback)) > max_len:
+    fallback_ad = template.format(fallback)
+    if len(fallback_ad) > max_len:
         raise ValueError('template + fallback should be <= '
                          + str(max_len) + ' chars')
     final_ad = []
     for rep in replacements:
-        if len(template.format(rep)) <= max_len:
-            final_ad.append(template.format(rep))
-        else:
-            final_ad.append(template.format(fallback))
+        ad = template.format(rep)
+        final_ad.append(ad if len(ad) <= max_len else fallback_ad)
 
     return [string.capwords(s) for s in final_ad] if capitalize else final_ad
+
+
+def _plain_template(template):
+    """Whether all the placeholders of ``template`` are bare, without a
+    format spec or conversion, so each one adds exactly the length of its
+    value."""
+    for _, field, spec, conversion in string.Formatter().parse(template):
+        if field is not None and (spec or conversion):
+            return False
+    return True
+
+
+def _capwords_format(template):
+    """Return the ``format`` method of ``template`` with its fixed text
+    capitalized, such that formatting it with a capitalized value gives the
+    same result as ``string.capwords(template.format(value))``, or None if
+    the placeholders are not separated from the fixed text by whitespace.
+    """
+    if '\x00' in template:
+        return None
+    parts = template.format('\x00').split('\x00')
+    for i, (left, right) in enumerate(zip(parts, parts[1:])):
+        left_ok = (i == 0 and not left) or left[-1:].isspace()
+        right_ok = ((i == len(parts) - 2 and not right)
+                    or right[:1].isspace())
+        if not (left_ok and right_ok):
+            return None
+    pieces = [string.capwords(parts[0]).replace('{', '{{').replace('}', '}}')]
+    for part in parts[1:]:
+        pieces.append('{0}')
+        pieces.append(string.capwords(part)
+                      .replace('{', '{{').replace('}', '}}'))
+    return ' '.join(piece for piece in pieces if piece).format
+
+
+def ad_create_batch(ads_df, max_len=30, capitalize=True):
+    """Create ads for each row of ``ads_df``, the same way as
+    :func:`ad_create` but for many templates, replacements, and fallbacks
+    at once.
+
+    The fixed length of each unique template is calculated once, so the
+    choice between the replacement and fallback is made with array
+    arithmetic on lengths, and each ad is formatted only once. When
+    capitalizing, each unique template and value is capitalized once.
+    Rows with templates that use format specs or conversions (e.g.
+    ``{:>8}``, ``{!r}``) are created with :func:`ad_create` one by one.
+
+    :param ads_df: DataFrame with the columns ``template``, ``replacement``
+        and ``fallback``, one row per ad
+    :param max_len: the maximum allowed length of the full string
+    :param capitalize: whether or not to capitalize words in the result
+    :returns formatted: pandas.Series of strings, with the same index as
+        ``ads_df``
+
+    >>> ads_df = pd.DataFrame({
+    ...     'template': ['My favorite car is {}'] * 2 + ['Visit {} today'],
+    ...     'replacement': ['Toyota', 'Lamborghini', 'New York'],
+    ...     'fallback': ['great', 'great', 'us']})
+    >>> ad_create_batch(ads_df, max_len=28)
+    0    My Favorite Car Is Toyota
+    1     My Favorite Car Is Great
+    2         Visit New York Today
+    dtype: object
+    """
+    template_codes, templates = pd.factorize(ads_df['template'])
+    plain = np.array([_plain_template(t) for t in templates], dtype=bool)
+    if not plain.all():
+        is_plain = plain[template_codes]
+        ads = pd.Series(None, index=ads_df.index, dtype=object)
+        if is_plain.any():
+            ads[is_plain] = ad_create_batch(ads_df[is_plain], max_len,
+                                            capitalize).tolist()
+        other = ads_df[~is_plain]
+        ads[~is_plain] = [ad_create(t, [r], f, max_len, capitalize)[0]
+                          for t, r, f in zip(other['template'],
+                                             other['replacement'],
+                                             other['fallback'])]
+        return ads
+    fixed_len = np.array([len(t.format('')) for t in templates])
+    num_slots = np.array([len(t.format('_')) for t in templates]) - fixed_len
+    fixed_len = fixed_len[template_codes]
+    num_slots = num_slots[template_codes]
+
+    rep_codes, replacements = pd.factorize(ads_df['replacement'].astype(str))
+    fb_codes, fallbacks = pd.factorize(ads_df['fallback'].astype(str))
+    rep_len = np.array([len(r) for r in replacements])[rep_codes]
+    fallback_len = np.array([len(f) for f in fallbacks])[fb_codes]
+    if (fixed_len + num_slots * fallback_len > max_len).any():
+        raise ValueError('template + fallback should be <= '
+                         + str(max_len) + ' chars')
+    values = list(replacements) + list(fallbacks)
+    value_codes = np.where(fixed_len + num_slots * rep_len <= max_len,
+                           rep_codes, len(replacements) + fb_codes)
+    formats = [t.format for t in templates]
+    rows = zip(template_codes.tolist(), value_codes.tolist())
+    if not capitalize:
+        return pd.Series([formats[code](values[val]) for code, val in rows],
+                         index=ads_df.index, dtype=object)
+
+    cap_formats = [_capwords_format(t) for t in templates]
+    cap_values = [string.capwords(v) for v in values]
+    ads = [cap_formats[code](cap_values[val])
+           if cap_formats[code] is not None and cap_values[val]
+           else string.capwords(formats[code](values[val]))
+           for code, val in rows]
+    return pd.Series(ads, index=ads_df.index, dtype=object)
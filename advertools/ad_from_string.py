@@ -1,4 +1,41 @@
+import os
 import string
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate, repeat
+
+import pandas as pd
+
+
+def _pack_slots(words, slots):
+    """Greedily pack ``words`` into ``slots``, and return the slot strings
+    and the index of the first word that didn't fit.
+
+    A running sum of word lengths (plus one for each separating space) is
+    computed once, and the end of each slot is found by bisecting it, so the
+    whole text is processed in linear time. As in the original algorithm, a
+    word is added to a slot only if the slot would still have at least one
+    free character, and filling stops at the first word that doesn't fit.
+    """
+    # ends[k] is the length of the first k words, with a space after each
+    ends = [0]
+    ends.extend(accumulate([len(w) + 1 for w in words]))
+    has_empty = '' in words
+    slot_texts = []
+    start = 0
+    for slot in slots:
+        if has_empty and slot >= 1:
+            # empty words (from an explicit ``sep``) at the start of a slot
+            # are absorbed without adding a space
+            while start < len(words) and not words[start]:
+                start += 1
+        end = bisect_right(ends, ends[start] + slot + 1, start) - 1
+        if end < start or (end == start + 1
+                           and ends[end] - ends[start] > slot):
+            end = start
+        slot_texts.append(' '.join(words[start:end]))
+        start = end
+    return slot_texts, start
 
 
 def ad_from_string(s, slots=(30, 30, 30, 90, 90, 15, 15), sep=None,
@@ -38,18 +75,49 @@ def ad_from_string(s, slots=(30, 30, 30, 90, 90, 15, 15), sep=None,
      '', '', '', '', '', '']
     """
     str_words = s.split(sep=sep)
-    text_ad = ['' for x in range(len(slots)+1)]
-    counter = 0
-
-    for i, slot in enumerate(slots):
-        while counter <= len(str_words) - 1:
-            if len(text_ad[i] + str_words[counter]) + 1 > slot:
-                break
-            text_ad[i] += (' ' + str_words[counter] if text_ad[i]
-                           else str_words[counter])
-            counter += 1
-
-    text_ad[-1] = (sep.join(str_words[counter:])
+    text_ad, counter = _pack_slots(str_words, slots)
+    text_ad.append(sep.join(str_words[counter:])
                    if sep is not None else ' '.join(str_words[counter:]))
 
     return [string.capwords(x) if capitalize else x for x in text_ad]
+
+
+def ads_from_strings(texts, slots=(30, 30, 30, 90, 90, 15, 15), sep=None,
+                     capitalize=False, n_jobs=None):
+    """Convert each of ``texts`` to an ad, the same way as
+    :func:`ad_from_string`, with one row per text and one column per slot.
+
+    :param texts: iterable of strings, e.g. product descriptions
+    :param slots: an iterable of integers for the maximum lengths for
+        each slot
+    :param sep: by which character to split each text
+    :param capitalize: whether or not to capitalize each word after grouping
+    :param n_jobs: the number of processes across which texts are spread,
+        -1 to use all CPUs. Defaults to None, all texts in the current
+        process. The result is the same, in the same order of texts.
+    :returns ads_df: DataFrame with the columns slot_1, slot_2, ...,
+        remainder
+
+    >>> ads_from_strings(['this is a short ad for you and them',
+    ...                   'slots can be changed the way you want'],
+    ...                  slots=(10, 15, 10))
+          slot_1          slot_2   slot_3 remainder
+    0  this is a    short ad for  you and      them
+    1  slots can  be changed the  way you      want
+    """
+    if isinstance(texts, str):
+        texts = [texts]
+    texts = list(texts)
+    slots = tuple(slots)
+    columns = ['slot_' + str(i) for i in range(1, len(slots) + 1)]
+    columns.append('remainder')
+    args = (texts, repeat(slots), repeat(sep), repeat(capitalize))
+    if n_jobs is None or n_jobs == 1 or len(texts) < 2:
+        ads = list(map(ad_from_string, *args))
+    else:
+        max_workers = os.cpu_count() if n_jobs == -1 else n_jobs
+        chunksize = max(1, len(texts) // (max_workers * 4))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            ads = list(executor.map(ad_from_string, *args,
+                                    chunksize=chunksize))
+    return pd.DataFrame(ads, columns=columns)
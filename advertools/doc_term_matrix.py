@@ -0,0 +1,87 @@
+from array import array
+from itertools import repeat
+
+import numpy as np
+
+from advertools.word_frequency import _rm_words_set
+from advertools.word_tokenize import _tokenize
+
+
+def doc_term_matrix(text_list, num_list=None, phrase_len=1,
+                    rm_words=None):
+    """Create a sparse document-term matrix out of ``text_list``, together
+    with its vocabulary, ready to be used for clustering, topic modeling, etc.
+
+    Tokenization is the same as in :func:`word_tokenize`, and the matrix is
+    built while walking the tokens only once. Requires ``scipy``.
+
+    :param text_list: iterable of strings, the documents (rows).
+    :param num_list: iterable of numbers, optional.
+        A list of numbers with the same length as ``text_list``. Each
+        occurrence of a phrase in a document is counted as its respective
+        value in ``num_list`` instead of one (views, sales, etc.)
+    :param phrase_len: integer, the length in words of each phrase
+        (column), defaults to 1.
+    :param rm_words: iterable of strings, phrases to exclude from the
+        vocabulary. Defaults to English stopwords.
+    :returns (matrix, vocabulary):
+        matrix: ``scipy.sparse.csr_matrix`` of shape
+        (documents, phrases), with int32 indices.
+        vocabulary: ``numpy.ndarray`` of the phrases, in the order of the
+        matrix columns.
+
+    >>> text_list = ['apple orange', 'apple orange banana',
+    ...              'apple kiwi', 'kiwi mango']
+    >>> matrix, vocab = doc_term_matrix(text_list)
+    >>> vocab
+    array(['apple', 'orange', 'banana', 'kiwi', 'mango'], dtype=object)
+    >>> matrix.toarray()
+    array([[1, 1, 0, 0, 0],
+           [1, 1, 1, 0, 0],
+           [1, 0, 0, 1, 0],
+           [0, 0, 0, 1, 1]])
+
+    >>> matrix, vocab = doc_term_matrix(text_list, num_list=[10, 20, 30, 40])
+    >>> matrix.toarray()
+    array([[10, 10,  0,  0,  0],
+           [20, 20, 20,  0,  0],
+           [30,  0,  0, 30,  0],
+           [ 0,  0,  0, 40, 40]])
+    """
+    try:
+        from scipy.sparse import csr_matrix
+    except ImportError:
+        raise ImportError('doc_term_matrix requires scipy, please install '
+                          'it with `pip install scipy`')
+    if isinstance(text_list, str):
+        text_list = [text_list]
+    rm_words = _rm_words_set(rm_words)
+
+    vocabulary = {}
+    indices = array('i')
+    indptr = array('l', [0])
+    data = []
+    weighted = num_list is not None
+    if not weighted:
+        num_list = repeat(1)
+
+    for text, num in zip(text_list, num_list):
+        for phrase in _tokenize(text, phrase_len):
+            if phrase in rm_words:
+                continue
+            indices.append(vocabulary.setdefault(phrase, len(vocabulary)))
+            if weighted:
+                data.append(num)
+        indptr.append(len(indices))
+
+    if weighted:
+        data = np.array(data)
+    else:
+        data = np.ones(len(indices), dtype='int64')
+    matrix = csr_matrix((data, np.frombuffer(indices, dtype='int32'),
+                         np.array(indptr, dtype='int32')),
+                        shape=(len(indptr) - 1, len(vocabulary)))
+    matrix.sum_duplicates()
+    vocab = np.empty(len(vocabulary), dtype=object)
+    vocab[:] = list(vocabulary)
+    return matrix, vocab
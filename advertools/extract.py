@@ -9,9 +9,13 @@ import re
 from unicodedata import name
 from collections import Counter
 from urllib.parse import urlparse
+
+import numpy as np
+
 from .emoji import EMOJI, EMOJI_ENTRIES
 from .regex import (MENTION, HASHTAG, CURRENCY, CURRENCY_RAW, EXCLAMATION,
                     EXCLAMATION_MARK, QUESTION, QUESTION_MARK, URL)
+from .word_tokenize import TokenizedCorpus
 
 
 def extract(text_list, regex, key_name, extracted=None, **kwargs):
@@ -646,7 +650,9 @@ def extract_words(text_list, words_to_extract, entire_words_only=False):
     Get a summary of the number of words, their frequency, the top
     ones, and more.
 
-    :param text_list: A list of text strings.
+    :param text_list: A list of text strings, or a ``TokenizedCorpus``.
+        With a corpus, words are matched against its vocabulary once, and
+        the extracted words are the corpus words (delimiters stripped).
     :param words_to_extract: A list of words to extract from ``text_list``.
     :param entire_words_only: Whether or not to find only complete words
         (as specified by ``words_to_find``) or find any any of the
@@ -729,6 +735,10 @@ def extract_words(text_list, words_to_extract, entire_words_only=False):
     if isinstance(words_to_extract, str):
         words_to_extract = [words_to_extract]
 
+    if isinstance(text_list, TokenizedCorpus):
+        return _extract_corpus_words(text_list, words_to_extract,
+                                     entire_words_only)
+
     text_list = [text.lower() for text in text_list]
     words_to_extract = [word.lower() for word in words_to_extract]
 
@@ -740,3 +750,23 @@ def extract_words(text_list, words_to_extract, entire_words_only=False):
         word_regex = re.compile('|'.join(regex), re.IGNORECASE)
 
     return extract(text_list, word_regex, 'word')
+
+
+def _extract_corpus_words(corpus, words_to_extract, entire_words_only):
+    """Run :func:`extract_words` on a :class:`TokenizedCorpus`, by matching
+    each word of its vocabulary once instead of each word of each text."""
+    words_to_extract = [word.lower() for word in words_to_extract]
+    if entire_words_only:
+        words_to_extract = set(words_to_extract)
+        matched = [word in words_to_extract for word in corpus.vocabulary]
+    else:
+        matched = [any(w in word for w in words_to_extract)
+                   for word in corpus.vocabulary]
+    matched = np.array(matched, dtype=bool)
+    positions = np.flatnonzero(matched[corpus.ids])
+    doc_index = np.searchsorted(corpus.offsets, positions, side='right') - 1
+    extracted = [[] for i in range(len(corpus))]
+    for doc, word in zip(doc_index.tolist(),
+                         corpus.vocabulary[corpus.ids[positions]].tolist()):
+        extracted[doc].append(word)
+    return extract(corpus, None, 'word', extracted=extracted)
@@ -1,17 +1,175 @@
 
-__all__ = ['kw_broad', 'kw_exact', 'kw_generate', 'kw_modified',
-           'kw_neg_broad', 'kw_neg_exact', 'kw_neg_phrase',
+__all__ = ['kw_all_match_types', 'kw_broad', 'kw_exact', 'kw_generate',
+           'kw_generate_chunks', 'kw_generate_count', 'kw_generate_to_file',
+           'kw_modified', 'kw_neg_broad', 'kw_neg_exact', 'kw_neg_phrase',
            'kw_phrase']
 
+import os
 import re
-from itertools import permutations, combinations
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, combinations, permutations, repeat
+from math import factorial
 
+import numpy as np
 import pandas as pd
 
+_KW_BROAD_REGEX = re.compile(r'^\'|^\"|\'$|\"$|\+|^\[|\]$|^-')
+
+KW_HEADERS = ['Campaign', 'Ad Group', 'Keyword', 'Criterion Type', 'Labels']
+
+
+def _validate_kw_args(match_types, max_len):
+    match_types = [x.title() for x in match_types]
+    possible_match_types = ['Exact', 'Phrase', 'Broad', 'Modified']
+    if not set(match_types).issubset(possible_match_types):
+        raise ValueError('please make sure match types are any of '
+                         + str(possible_match_types))
+
+    if max_len < 2:
+        raise ValueError('please make sure max_len is >= 2')
+    return match_types
+
+
+def _n_permutations(n, k):
+    return factorial(n) // factorial(n - k) if 0 <= k <= n else 0
+
+
+def _n_combinations(n, k):
+    return _n_permutations(n, k) // factorial(k) if 0 <= k <= n else 0
+
+
+def kw_generate_count(products, words, max_len=3,
+                      match_types=('Exact', 'Phrase', 'Modified'),
+                      order_matters=True):
+    """Return the number of rows that :func:`kw_generate` would return for
+    the same arguments, without generating them.
+
+    >>> kw_generate_count(['bmw', 'toyota'], ['buy', 'second hand'])
+    60
+    >>> kw_generate_count(['bmw'], ['w' + str(i) for i in range(50)],
+    ...                   max_len=4)
+    1433550
+    """
+    match_types = _validate_kw_args(match_types, max_len)
+    count_func = _n_permutations if order_matters else _n_combinations
+    words = list(words)
+    total = 0
+    for prod in products:
+        pool = len(words) + 1
+        # all tuples minus the ones without any occurrence of ``prod``
+        without_prod = pool - 1 - words.count(prod)
+        for i in range(2, max_len+1):
+            total += count_func(pool, i) - count_func(without_prod, i)
+    return total * len(match_types)
+
+
+def _index_tuples(n, length, order_matters):
+    """Return all permutations/combinations of ``range(n)`` of ``length``
+    as a 2D array of the smallest unsigned integer type that fits ``n``,
+    one tuple per row."""
+    comb_func = permutations if order_matters else combinations
+    flat = np.fromiter(chain.from_iterable(comb_func(range(n), length)),
+                       dtype=np.min_scalar_type(n))
+    return flat.reshape(-1, length)
+
+
+def _kw_index_tuples(is_prod, max_len, order_matters):
+    """Yield the word index tuples of the keywords of a product, for each
+    keyword length, as 2D integer arrays in ``itertools`` order, where
+    ``is_prod`` marks the indexes of the product (always including 0).
+
+    Only integer indexes are held for a whole keyword length, the keyword
+    strings are built from slices of them.
+    """
+    n = len(is_prod)
+    prod_in_words = is_prod[1:].any()
+    for i in range(2, max_len+1):
+        if prod_in_words:
+            tuples = _index_tuples(n, i, order_matters)
+            yield tuples[is_prod[tuples].any(axis=1)]
+        elif order_matters:
+            others = _index_tuples(n - 1, i - 1, order_matters) + 1
+            tuples = np.concatenate([np.insert(others, pos, 0, axis=1)
+                                     for pos in range(i)])
+            yield tuples[np.lexsort(tuples.T[::-1])]
+        else:
+            others = _index_tuples(n - 1, i - 1, order_matters) + 1
+            yield np.insert(others, 0, 0, axis=1)
+
+
+def _kw_batch_df(tuples, tokens, titles, is_prod, match_types,
+                 campaign_name):
+    """Return the keywords of the word index ``tuples`` of one product as a
+    DataFrame, in all of ``match_types``."""
+    keywords = tokens[tuples[:, 0]]
+    for j in range(1, tuples.shape[1]):
+        keywords = keywords + ' ' + tokens[tuples[:, j]]
+    if is_prod[1:].any():
+        labels = np.full(len(tuples), '', dtype=object)
+        has_label = np.zeros(len(tuples), dtype=bool)
+        for j in range(tuples.shape[1]):
+            title = titles[tuples[:, j]]
+            keep = ~is_prod[tuples[:, j]]
+            labels = np.where(keep & has_label, labels + ';' + title,
+                              np.where(keep, title, labels))
+            has_label |= keep
+    else:
+        others = tuples[tuples != 0].reshape(len(tuples), -1)
+        labels = titles[others[:, 0]]
+        for j in range(1, others.shape[1]):
+            labels = labels + ';' + titles[others[:, j]]
+    keywords = pd.Series(keywords, dtype=object)
+    keyword_cols = []
+    for match in match_types:
+        if match == 'Modified':
+            keyword_cols.append('+' + keywords.str.replace(' ', ' +',
+                                                           regex=False))
+        else:
+            keyword_cols.append(keywords)
+    criterion = ['Broad' if m == 'Modified' else m for m in match_types]
+    return pd.DataFrame({
+        'Campaign': campaign_name,
+        'Ad Group': tokens[0].title(),
+        'Keyword': np.column_stack(keyword_cols).ravel(),
+        'Criterion Type': np.tile(np.array(criterion, dtype=object),
+                                  len(keywords)),
+        'Labels': np.repeat(labels, len(match_types)),
+    }, columns=KW_HEADERS)
+
+
+def _kw_product_frames(prod, words, max_len, match_types, order_matters,
+                       campaign_name, batchsize=None):
+    """Yield the keywords of a single product as DataFrames, built from
+    slices of at most ``batchsize`` word index tuples (all of each keyword
+    length if None).
+
+    Keywords are built on arrays of word indexes, with ``prod`` as index 0,
+    and rows are ordered as ``itertools`` would generate them.
+    """
+    tokens = np.array([prod] + words, dtype=object)
+    titles = np.array([w.title() for w in tokens], dtype=object)
+    is_prod = tokens == prod
+    for tuples in _kw_index_tuples(is_prod, max_len, order_matters):
+        step = batchsize or max(1, len(tuples))
+        for start in range(0, len(tuples), step):
+            yield _kw_batch_df(tuples[start:start + step], tokens, titles,
+                               is_prod, match_types, campaign_name)
+
+
+def _kw_product_df(prod, words, max_len, match_types, order_matters,
+                   campaign_name):
+    """Return the keywords of a single product as a DataFrame."""
+    frames = list(_kw_product_frames(prod, words, max_len, match_types,
+                                     order_matters, campaign_name))
+    if not frames:
+        return pd.DataFrame(columns=KW_HEADERS)
+    return pd.concat(frames, ignore_index=True)
+
 
 def kw_generate(products, words, max_len=3,
                 match_types=('Exact', 'Phrase', 'Modified'),
-                order_matters=True, campaign_name='SEM_Campaign'):
+                order_matters=True, campaign_name='SEM_Campaign',
+                n_jobs=None, compact=False):
     """Generate a data frame of keywords using a list of products and relevant
     words.
 
@@ -25,6 +183,14 @@ def kw_generate(products, words, max_len=3,
     :param order_matters: whether or not the order of words in keywords
         matters, default False
     :param campaign_name: name of campaign
+    :param n_jobs: the number of processes across which products are spread,
+        -1 to use all CPUs. Defaults to None, all products in the current
+        process. The result is the same, in the same order of products.
+    :param compact: whether or not to return memory-compact columns;
+        ``Campaign``, ``Ad Group``, ``Criterion Type`` and ``Labels`` as
+        categoricals, and ``Keyword`` as Arrow-backed strings (if
+        ``pyarrow`` is installed, otherwise pandas strings). Recommended
+        for millions of keywords.
     :returns keywords_df: a pandas.DataFrame ready to upload
 
     >>> import advertools as adv
@@ -47,34 +213,160 @@ def kw_generate(products, words, max_len=3,
     58  SEM_Campaign   Toyota     second hand buy toyota         Phrase  Second Hand;Buy
     59  SEM_Campaign   Toyota  +second hand +buy +toyota          Broad  Second Hand;Buy
     """
-    match_types = [x.title() for x in match_types]
-    possible_match_types = ['Exact', 'Phrase', 'Broad', 'Modified']
-    if not set(match_types).issubset(possible_match_types):
-        raise ValueError('please make sure match types are any of '
-                         + str(possible_match_types))
-
-    if max_len < 2:
-        raise ValueError('please make sure max_len is >= 2')
+    match_types = _validate_kw_args(match_types, max_len)
+    products = list(products)
+    args = (products, repeat(list(words)), repeat(max_len),
+            repeat(match_types), repeat(order_matters), repeat(campaign_name))
+    if n_jobs is None or n_jobs == 1 or len(products) < 2:
+        frames = list(map(_kw_product_df, *args))
+    else:
+        max_workers = os.cpu_count() if n_jobs == -1 else n_jobs
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            frames = list(executor.map(_kw_product_df, *args))
+    if not frames:
+        return pd.DataFrame(columns=KW_HEADERS)
+    keywords_df = pd.concat(frames, ignore_index=True)
+    if compact:
+        keywords_df = _compact_kw_df(keywords_df, products, frames,
+                                     match_types, campaign_name)
+    return keywords_df
+
+
+def _compact_kw_df(keywords_df, products, frames, match_types,
+                   campaign_name):
+    """Convert the repetitive columns of ``keywords_df`` to categoricals,
+    using codes known from the way keywords are generated, instead of
+    hashing millions of strings."""
+    num_rows = len(keywords_df)
+    ad_group_codes, ad_groups = pd.factorize([p.title() for p in products])
+    criteria = ['Broad' if m == 'Modified' else m for m in match_types]
+    criterion_codes, criterion_types = pd.factorize(criteria)
+    label_codes, labels = pd.factorize(keywords_df['Labels'])
+    try:
+        import pyarrow  # noqa: F401
+        keyword_dtype = 'string[pyarrow]'
+    except ImportError:
+        keyword_dtype = 'string'
+    return pd.DataFrame({
+        'Campaign': pd.Categorical.from_codes(
+            np.zeros(num_rows, dtype='int8'), [campaign_name]),
+        'Ad Group': pd.Categorical.from_codes(
+            np.repeat(ad_group_codes, [len(f) for f in frames]), ad_groups),
+        'Keyword': keywords_df['Keyword'].astype(keyword_dtype),
+        'Criterion Type': pd.Categorical.from_codes(
+            np.tile(criterion_codes, num_rows // len(criteria)),
+            criterion_types),
+        'Labels': pd.Categorical.from_codes(label_codes, labels),
+    }, columns=KW_HEADERS)
+
+
+def kw_generate_chunks(products, words, max_len=3,
+                       match_types=('Exact', 'Phrase', 'Modified'),
+                       order_matters=True, campaign_name='SEM_Campaign',
+                       chunksize=100000):
+    """Generate the same keywords as :func:`kw_generate`, as DataFrames of
+    at most ``chunksize`` rows each, without holding the full table in
+    memory.
+
+    The keywords of each product are built in slices of about
+    ``chunksize`` rows, so memory depends on ``chunksize`` and not on the
+    number of keywords of the largest product. The index of each chunk
+    continues from the previous one, so concatenating all chunks gives the
+    same DataFrame as :func:`kw_generate`.
+
+    :param chunksize: the maximum number of rows of each DataFrame
+    :returns chunks: a generator of pandas.DataFrame
 
-    comb_func = permutations if order_matters else combinations
-    headers = ['Campaign', 'Ad Group', 'Keyword', 'Criterion Type', 'Labels']
-    keywords_list = []
-    for prod in products:
-        for i in range(2, max_len+1):
-            for comb in comb_func([prod] + words, i):
-                if prod not in comb:
-                    continue
-                for match in match_types:
-                    row = [
-                        campaign_name,
-                        prod.title(),
-                        (' '.join(comb) if match != 'Modified' else
-                            '+' + ' '.join(comb).replace(' ', ' +')),
-                        match if match != 'Modified' else 'Broad',
-                        ';'.join([x.title() for x in comb if x != prod])
-                    ]
-                    keywords_list.append(row)
-    return pd.DataFrame.from_records(keywords_list, columns=headers)
+    >>> products = ['bmw', 'toyota']
+    >>> words = ['buy', 'second hand']
+    >>> for chunk in kw_generate_chunks(products, words, chunksize=25):
+    ...     print(chunk.shape, chunk.index[0])
+    (25, 5) 0
+    (25, 5) 25
+    (10, 5) 50
+    """
+    match_types = _validate_kw_args(match_types, max_len)
+    if chunksize < 1:
+        raise ValueError('please make sure chunksize is >= 1')
+    words = list(words)
+    batchsize = max(1, chunksize // max(1, len(match_types)))
+    frames = chain.from_iterable(
+        _kw_product_frames(prod, words, max_len, match_types, order_matters,
+                           campaign_name, batchsize)
+        for prod in products)
+    return _chunk_frames(frames, chunksize)
+
+
+def _chunk_frames(frames, chunksize):
+    """Yield the rows of ``frames`` (built one at a time, of about
+    ``chunksize`` rows each) as DataFrames of ``chunksize`` rows, except
+    the last one, with a continuous index."""
+    start = 0
+    pending, pending_len = [], 0
+    for frame in frames:
+        pos = 0
+        while pos < len(frame):
+            take = min(chunksize - pending_len, len(frame) - pos)
+            pending.append(frame.iloc[pos:pos + take])
+            pending_len += take
+            pos += take
+            if pending_len == chunksize:
+                yield _concat_chunk(pending, start)
+                start += pending_len
+                pending, pending_len = [], 0
+    if pending:
+        yield _concat_chunk(pending, start)
+
+
+def _concat_chunk(frames, start):
+    df = pd.concat(frames, ignore_index=True)
+    df.index = pd.RangeIndex(start, start + len(df))
+    return df
+
+
+def kw_generate_to_file(path, products, words, max_len=3,
+                        match_types=('Exact', 'Phrase', 'Modified'),
+                        order_matters=True, campaign_name='SEM_Campaign',
+                        format='csv', chunksize=100000):
+    """Write the keywords of :func:`kw_generate` to a bulk-upload file,
+    chunk by chunk, without holding the full table in memory.
+
+    The columns are the same as :func:`kw_generate`, ready to be uploaded.
+
+    :param path: the file to write to, it is overwritten if it exists
+    :param format: 'csv' or 'parquet' (requires ``pyarrow``)
+    :param chunksize: the number of rows written at a time
+    :returns num_rows: the number of keyword rows written
+
+    >>> kw_generate_to_file('keywords.csv', ['bmw', 'toyota'],
+    ...                     ['buy', 'second hand'])
+    60
+    """
+    if format not in ('csv', 'parquet'):
+        raise ValueError("please make sure format is 'csv' or 'parquet'")
+    chunks = kw_generate_chunks(products, words, max_len, match_types,
+                                order_matters, campaign_name, chunksize)
+    num_rows = 0
+    if format == 'csv':
+        pd.DataFrame(columns=KW_HEADERS).to_csv(path, index=False)
+        for chunk in chunks:
+            chunk.to_csv(path, mode='a', header=False, index=False)
+            num_rows += len(chunk)
+        return num_rows
+
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("format='parquet' requires pyarrow, please "
+                          "install it with `pip install pyarrow`")
+    schema = pa.schema([(col, pa.string()) for col in KW_HEADERS])
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in chunks:
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema,
+                                                    preserve_index=False))
+            num_rows += len(chunk)
+    return num_rows
 
 
 def kw_broad(words):
@@ -87,8 +379,7 @@ def kw_broad(words):
     >>> kw_broad(keywords)
     ['learn guitar', 'guitar courses', 'guitar tutor']
     """
-    regex = r'^\'|^\"|\'$|\"$|\+|^\[|\]$|^-'
-    return [re.sub(regex, '', x) for x in words]
+    return [_KW_BROAD_REGEX.sub('', x) for x in words]
 
 
 def kw_exact(words):
@@ -167,3 +458,38 @@ def kw_neg_exact(words):
     ['-[learn guitar]', '-[guitar courses]', '-[guitar tutor]']
     """
     return ['-' + w for w in kw_exact(words)]
+
+
+def kw_all_match_types(words):
+    """Return ``words`` in all match types, as columns of a DataFrame.
+
+    Faster than calling each of the ``kw_*`` functions, because ``words``
+    are converted to broad match (stripping any match type symbols) only
+    once, and the other match types are created from that.
+
+    :param words: list or pandas.Series of strings
+    :returns formatted: DataFrame with the columns: broad, exact, phrase,
+        modified, neg_broad, neg_phrase, neg_exact, in the same index as
+        ``words`` if it's a Series
+
+    >>> keywords = ['[learn guitar]', '"guitar courses"', '+guitar +tutor']
+    >>> kw_all_match_types(keywords)[['broad', 'modified', 'neg_exact']]
+                broad          modified          neg_exact
+    0    learn guitar    +learn +guitar    -[learn guitar]
+    1  guitar courses  +guitar +courses  -[guitar courses]
+    2    guitar tutor    +guitar +tutor    -[guitar tutor]
+    """
+    if not isinstance(words, pd.Series):
+        words = pd.Series(list(words), dtype=object)
+    broad = words.str.replace(_KW_BROAD_REGEX, '', regex=True)
+    exact = '[' + broad + ']'
+    phrase = '"' + broad + '"'
+    return pd.DataFrame({
+        'broad': broad,
+        'exact': exact,
+        'phrase': phrase,
+        'modified': '+' + broad.str.replace(' ', ' +', regex=False),
+        'neg_broad': '-' + broad,
+        'neg_phrase': '-' + phrase,
+        'neg_exact': '-' + exact,
+    })
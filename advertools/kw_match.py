@@ -0,0 +1,272 @@
+__all__ = ['kw_match', 'kw_neg_conflicts']
+
+from collections import Counter, defaultdict
+
+import numpy as np
+import pandas as pd
+
+from advertools.kw_generate import _KW_BROAD_REGEX
+
+NEG_CONFLICT_HEADERS = ['keyword', 'negative', 'match_type']
+
+KW_MATCH_HEADERS = ['search_term', 'keyword', 'match_type', 'ad_group']
+
+_MATCH_PRIORITY = {'Exact': 0, 'Phrase': 1, 'Modified': 2, 'Broad': 3}
+
+
+def _kw_tokens(keyword):
+    """Return the lower-case tokens of ``keyword``, without any match type
+    symbols."""
+    return tuple(_KW_BROAD_REGEX.sub('', keyword.strip()).lower().split())
+
+
+def _neg_match_type(negative):
+    """Return the match type and tokens of ``negative`` from its symbols,
+    with or without the leading minus sign."""
+    negative = negative.strip()
+    if negative.startswith('-'):
+        negative = negative[1:]
+    if negative.startswith('[') and negative.endswith(']'):
+        match_type = 'Exact'
+    elif negative.startswith('"') and negative.endswith('"'):
+        match_type = 'Phrase'
+    else:
+        match_type = 'Broad'
+    return match_type, _kw_tokens(negative)
+
+
+def _kw_match_type(keyword):
+    """Return the match type of ``keyword`` from its symbols."""
+    keyword = keyword.strip()
+    if keyword.startswith('[') and keyword.endswith(']'):
+        return 'Exact'
+    if keyword.startswith('"') and keyword.endswith('"'):
+        return 'Phrase'
+    if '+' in keyword:
+        return 'Modified'
+    return 'Broad'
+
+
+def kw_match(search_terms, keywords):
+    """Return the keyword, match type, and ad group that would be triggered
+    by each of ``search_terms``.
+
+    Matching follows the rules of each match type, and if more than one
+    keyword matches a search term, the more specific match type wins
+    (exact, then phrase, then modified broad, then broad), then the longer
+    keyword, then the first one in ``keywords``:
+
+    * Exact: the search term is the same words, in the same order.
+    * Phrase: the search term contains the words, in the same order and
+      next to each other.
+    * Modified broad and broad: the search term contains all the words, in
+      any order. Close variants and related searches of broad match are not
+      modeled.
+
+    Matching is case-insensitive. Keywords are indexed once (exact and
+    phrase in hash tables of their words, modified and broad in an inverted
+    index of their least common word), and each unique search term is
+    matched only once, no matter how many times it appears.
+
+    :param search_terms: list or pandas.Series of strings, e.g. the search
+        terms report
+    :param keywords: DataFrame with the columns ``Keyword``,
+        ``Criterion Type`` and optionally ``Ad Group``, like the output of
+        :func:`kw_generate`, or a list of keywords in any of the formats of
+        the ``kw_*`` functions, e.g. ``[running shoes]``
+    :returns matches_df: DataFrame with the columns: search_term, keyword,
+        match_type, ad_group, in the same order as ``search_terms``, with
+        missing values for terms that don't match any keyword
+
+    >>> keywords = ['[running shoes]', '"running shoes"', '+shoes +cheap']
+    >>> search_terms = ['running shoes', 'cheap running shoes',
+    ...                 'shoes for running', 'running shoes cheap']
+    >>> kw_match(search_terms, keywords)
+               search_term          keyword match_type ad_group
+    0        running shoes  [running shoes]      Exact     None
+    1  cheap running shoes  "running shoes"     Phrase     None
+    2    shoes for running             None       None     None
+    3  running shoes cheap  "running shoes"     Phrase     None
+    """
+    if isinstance(search_terms, str):
+        search_terms = [search_terms]
+    if isinstance(keywords, pd.DataFrame):
+        kw_list = keywords['Keyword'].tolist()
+        match_types = [
+            'Modified' if crit == 'Broad' and '+' in kw else crit
+            for kw, crit in zip(kw_list, keywords['Criterion Type'])]
+        if 'Ad Group' in keywords:
+            ad_groups = keywords['Ad Group'].tolist()
+        else:
+            ad_groups = [None] * len(kw_list)
+    else:
+        kw_list = [keywords] if isinstance(keywords, str) else list(keywords)
+        match_types = [_kw_match_type(kw) for kw in kw_list]
+        ad_groups = [None] * len(kw_list)
+
+    term_codes, unique_terms = pd.factorize(pd.Series(search_terms,
+                                                      dtype=object))
+    term_tokens = [_kw_tokens(term) for term in unique_terms]
+    token_counts = Counter(tok for tokens in term_tokens
+                           for tok in set(tokens))
+
+    exact_index = {}
+    phrase_index = {}
+    set_index = defaultdict(list)
+    for i, (kw, match_type) in enumerate(zip(kw_list, match_types)):
+        tokens = _kw_tokens(kw)
+        if not tokens:
+            continue
+        if match_type == 'Exact':
+            exact_index.setdefault(tokens, i)
+        elif match_type == 'Phrase':
+            phrase_index.setdefault(tokens, i)
+        else:
+            token_set = frozenset(tokens)
+            anchor = min(token_set, key=lambda tok: token_counts[tok])
+            rank = (_MATCH_PRIORITY[match_type], -len(token_set), i)
+            set_index[anchor].append((rank, token_set))
+    phrase_lengths = sorted({len(tokens) for tokens in phrase_index},
+                            reverse=True)
+
+    unique_matches = np.full(len(term_tokens), -1, dtype='int64')
+    for code, tokens in enumerate(term_tokens):
+        match = exact_index.get(tokens)
+        if match is None:
+            for length in phrase_lengths:
+                if length > len(tokens):
+                    continue
+                matches = [phrase_index[tokens[j:j+length]]
+                           for j in range(len(tokens) - length + 1)
+                           if tokens[j:j+length] in phrase_index]
+                if matches:
+                    match = min(matches)
+                    break
+        if match is None:
+            token_set = set(tokens)
+            ranks = [rank for tok in token_set
+                     for rank, kw_set in set_index.get(tok, ())
+                     if kw_set <= token_set]
+            if ranks:
+                match = min(ranks)[2]
+        if match is not None:
+            unique_matches[code] = match
+
+    matches = np.where(term_codes == -1, -1, unique_matches[term_codes])
+    found = matches != -1
+    keyword_col = np.full(len(matches), None, dtype=object)
+    match_type_col = np.full(len(matches), None, dtype=object)
+    ad_group_col = np.full(len(matches), None, dtype=object)
+    keyword_col[found] = np.array(kw_list, dtype=object)[matches[found]]
+    match_type_col[found] = np.array(match_types,
+                                     dtype=object)[matches[found]]
+    ad_group_col[found] = np.array(ad_groups, dtype=object)[matches[found]]
+    return pd.DataFrame({
+        'search_term': list(search_terms),
+        'keyword': keyword_col,
+        'match_type': match_type_col,
+        'ad_group': ad_group_col,
+    }, columns=KW_MATCH_HEADERS)
+
+
+def kw_neg_conflicts(keywords, negatives):
+    """Return the pairs of ``keywords`` and ``negatives`` where the negative
+    keyword would block the keyword.
+
+    The match type of each negative keyword is taken from its symbols, as
+    produced by :func:`kw_neg_broad`, :func:`kw_neg_phrase`, and
+    :func:`kw_neg_exact`:
+
+    * Broad (``-running shoes``): the keyword contains all the words, in any
+      order.
+    * Phrase (``-"running shoes"``): the keyword contains the words, in the
+      same order and next to each other.
+    * Exact (``-[running shoes]``): the keyword is the same words, in the
+      same order.
+
+    Keywords can be in any match type, and matching is case-insensitive.
+    Negatives are indexed once (exact and phrase by their words, broad by
+    their least common word among the keywords), so each keyword is only
+    compared with the few negatives that could block it, instead of with all
+    of them.
+
+    :param keywords: list of strings, the positive keywords, e.g. the
+        ``Keyword`` column of :func:`kw_generate`
+    :param negatives: list of strings, the negative keywords
+    :returns conflicts_df: DataFrame with the columns: keyword, negative,
+        match_type (of the negative), sorted by the order of ``keywords``
+        then ``negatives``
+
+    >>> keywords = ['buy running shoes', '[cheap running shoes]',
+    ...             '+shoes +for +running']
+    >>> negatives = ['-cheap', '-"running shoes"', '-[shoes for running]']
+    >>> kw_neg_conflicts(keywords, negatives)
+                     keyword              negative match_type
+    0      buy running shoes      -"running shoes"     Phrase
+    1  [cheap running shoes]                -cheap      Broad
+    2  [cheap running shoes]      -"running shoes"     Phrase
+    3   +shoes +for +running  -[shoes for running]      Exact
+    """
+    if isinstance(keywords, str):
+        keywords = [keywords]
+    if isinstance(negatives, str):
+        negatives = [negatives]
+    keywords = list(keywords)
+    negatives = list(negatives)
+
+    unique_tokens = {}
+    kw_codes = [unique_tokens.setdefault(_kw_tokens(kw), len(unique_tokens))
+                for kw in keywords]
+    kw_tokens = list(unique_tokens)
+    token_counts = Counter(tok for tokens in kw_tokens
+                           for tok in set(tokens))
+
+    exact_index = defaultdict(list)
+    phrase_index = defaultdict(list)
+    broad_index = defaultdict(list)
+    for i, neg in enumerate(negatives):
+        match_type, tokens = _neg_match_type(neg)
+        if not tokens:
+            continue
+        if match_type == 'Exact':
+            exact_index[tokens].append(i)
+        elif match_type == 'Phrase':
+            phrase_index[tokens].append(i)
+        else:
+            token_set = frozenset(tokens)
+            anchor = min(token_set, key=lambda tok: token_counts[tok])
+            broad_index[anchor].append((i, token_set))
+    phrase_lengths = sorted({len(tokens) for tokens in phrase_index})
+
+    unique_conflicts = []
+    for code, tokens in enumerate(kw_tokens):
+        blocked = []
+        for i in exact_index.get(tokens, ()):
+            blocked.append((i, 'Exact'))
+        for length in phrase_lengths:
+            if length > len(tokens):
+                break
+            for j in range(len(tokens) - length + 1):
+                for i in phrase_index.get(tokens[j:j+length], ()):
+                    blocked.append((i, 'Phrase'))
+        token_set = set(tokens)
+        for tok in token_set:
+            for i, neg_set in broad_index.get(tok, ()):
+                if neg_set <= token_set:
+                    blocked.append((i, 'Broad'))
+        unique_conflicts.extend((code, i, match_type)
+                                for i, match_type in sorted(set(blocked)))
+
+    if not unique_conflicts:
+        return pd.DataFrame(columns=NEG_CONFLICT_HEADERS)
+    conflicts = pd.DataFrame(unique_conflicts,
+                             columns=['code', 'neg_index', 'match_type'])
+    keywords_df = pd.DataFrame({'kw_index': range(len(keywords)),
+                                'code': kw_codes})
+    conflicts = (keywords_df.merge(conflicts, on='code')
+                 .sort_values(['kw_index', 'neg_index'], kind='mergesort'))
+    return pd.DataFrame({
+        'keyword': [keywords[i] for i in conflicts['kw_index']],
+        'negative': [negatives[i] for i in conflicts['neg_index']],
+        'match_type': conflicts['match_type'].values,
+    }, columns=NEG_CONFLICT_HEADERS)
@@ -1,21 +1,69 @@
 
 __all__ = ['SERP_GOOG_VALID_VALS', 'YOUTUBE_TOPIC_IDS',
-           'YOUTUBE_VID_CATEGORY_IDS', 'serp_goog', 'serp_youtube',
-           'set_logging_level', 'youtube_channel_details',
+           'YOUTUBE_VID_CATEGORY_IDS', 'serp_goog', 'serp_goog_iter',
+           'serp_youtube',
+           'serp_rate_limit_stats', 'set_logging_level',
+           'set_max_in_flight_per_key', 'set_serp_rate_limit',
+           'set_serp_session', 'youtube_channel_details',
            'youtube_video_details']
 
 import datetime
+import gzip
+import hashlib
+import json
 import logging
-from itertools import product
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from email.utils import parsedate_to_datetime
+from functools import partial
+from itertools import islice, product
 
 import pandas as pd
 from pandas.io.json import json_normalize
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    def _json_loads(content):
+        return json.loads(content.decode('utf-8'))
 
 SERP_GOOG_LOG_FMT = ('%(asctime)s | %(levelname)s | %(filename)s:%(lineno)d '
                      '| %(funcName)s | %(message)s')
 logging.basicConfig(format=SERP_GOOG_LOG_FMT)
 
+# Parameters of serp_goog and serp_youtube that control how requests are
+# made, and are not sent to the API
+_SERP_OPTIONS = {'max_workers', 'session', 'cache', 'cache_ttl',
+                 'on_result', 'job_dir'}
+
+_JOB_MANIFEST = 'manifest.jsonl'
+
+_MAX_IN_FLIGHT_PER_KEY = 10
+_key_semaphores = {}
+_key_semaphores_lock = threading.Lock()
+
+_session = None
+_session_lock = threading.Lock()
+
+_QUERIES_PER_100S = None
+_DAILY_QUOTA = None
+_MAX_RETRIES = 3
+_BACKOFF = 1.0
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+_RATE_LIMIT_REASONS = {'rateLimitExceeded', 'userRateLimitExceeded'}
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+_rate_stats = {'requests': 0, 'retries': 0, 'throttled_seconds': 0.0,
+               'backoff_seconds': 0.0}
+_rate_stats_lock = threading.Lock()
+
 
 ##############################################################################
 # Google variables
@@ -398,22 +446,22 @@ def _split_by_comma(s, length=50):
     return str_list
 
 
-def youtube_video_details(key, vid_ids):
+def youtube_video_details(key, vid_ids, session=None, cache=None,
+                          cache_ttl=86400):
     """Return details of videos for which the ids are given.
     Assumes ``ids`` is a comma-separated list of video ids with
-    no spaces."""
+    no spaces. ``session``, ``cache`` and ``cache_ttl`` are the same as in
+    :func:`serp_youtube`."""
     base_url = ('https://www.googleapis.com/youtube/v3/videos?part='
                 'contentDetails,id,liveStreamingDetails,localizations,player,'
                 'recordingDetails,snippet,statistics,status,topicDetails')
     vid_ids = _split_by_comma(vid_ids, length=50)
-    final_df = pd.DataFrame()
+    frames = []
     for vid_id in vid_ids:
         params = {'id': vid_id, 'key': key}
-        logging.info(msg='Requesting: ' + 'video details')
-        video_resp = requests.get(base_url, params=params)
-        if video_resp.status_code >= 400:
-            raise Exception(video_resp.json())
-        items_df = pd.DataFrame(video_resp.json()['items'])
+        video_resp = _get_response(base_url, params, 'video details',
+                                   session, cache, cache_ttl)
+        items_df = pd.DataFrame(video_resp['items'])
         details = ['snippet', 'topicDetails', 'statistics',
                    'status', 'contentDetails']
         detail_df = pd.DataFrame()
@@ -422,30 +470,32 @@ def youtube_video_details(key, vid_ids):
                 detail_df = pd.concat([
                     detail_df,
                     pd.DataFrame([x[detail] for x in
-                                  video_resp.json()['items']])
+                                  video_resp['items']])
                 ], axis=1)
             except KeyError:
                 continue
         temp_df = pd.concat([items_df, detail_df], axis=1)
-        final_df = final_df.append(temp_df, sort=False, ignore_index=True)
-    return final_df
+        frames.append(temp_df)
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, sort=False, ignore_index=True)
 
 
-def youtube_channel_details(key, channel_ids):
+def youtube_channel_details(key, channel_ids, session=None, cache=None,
+                            cache_ttl=86400):
     """Return details of channels for which the ids are given.
     Assumes ``ids`` is a comma-separated list of channel ids with
-    no spaces."""
+    no spaces. ``session``, ``cache`` and ``cache_ttl`` are the same as in
+    :func:`serp_youtube`."""
     base_url = ('https://www.googleapis.com/youtube/v3/channels?part='
                 'snippet,contentDetails,statistics')
     channel_ids = _split_by_comma(channel_ids, length=50)
-    final_df = pd.DataFrame()
+    frames = []
     for channel_id in channel_ids:
         params = {'id': channel_id, 'key': key}
-        logging.info(msg='Requesting: ' + 'channel details')
-        channel_resp = requests.get(base_url, params=params)
-        if channel_resp.status_code >= 400:
-            raise Exception(channel_resp.json())
-        items_df = pd.DataFrame(channel_resp.json()['items'])
+        channel_resp = _get_response(base_url, params, 'channel details',
+                                     session, cache, cache_ttl)
+        items_df = pd.DataFrame(channel_resp['items'])
         details = ['snippet', 'statistics', 'contentDetails']
         detail_df = pd.DataFrame()
         for detail in details:
@@ -453,13 +503,475 @@ def youtube_channel_details(key, channel_ids):
                 detail_df = pd.concat([
                     detail_df,
                     pd.DataFrame([x[detail] for x in
-                                  channel_resp.json()['items']])
+                                  channel_resp['items']])
                 ], axis=1)
             except KeyError:
                 continue
         temp_df = pd.concat([items_df, detail_df], axis=1)
-        final_df = final_df.append(temp_df, sort=False, ignore_index=True)
-    return final_df
+        frames.append(temp_df)
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, sort=False, ignore_index=True)
+
+
+def _key_semaphore(key):
+    """Return the semaphore limiting the concurrent requests of ``key``."""
+    with _key_semaphores_lock:
+        if key not in _key_semaphores:
+            _key_semaphores[key] = threading.BoundedSemaphore(
+                _MAX_IN_FLIGHT_PER_KEY)
+        return _key_semaphores[key]
+
+
+def set_max_in_flight_per_key(n):
+    """Change the maximum number of concurrent requests for each API key,
+    when using ``max_workers`` in :func:`serp_goog` and
+    :func:`serp_youtube`. Defaults to 10.
+    """
+    global _MAX_IN_FLIGHT_PER_KEY
+    if not isinstance(n, int) or n < 1:
+        raise ValueError('Please make sure you supply a positive integer')
+    with _key_semaphores_lock:
+        _MAX_IN_FLIGHT_PER_KEY = n
+        _key_semaphores.clear()
+
+
+class _TokenBucket:
+    """Limit requests to ``queries_per_100s`` per 100 seconds, in bursts of
+    up to that many, and to ``daily_quota`` per 24 hours. None means no
+    limit."""
+
+    def __init__(self, queries_per_100s=None, daily_quota=None):
+        self.rate = queries_per_100s / 100 if queries_per_100s else None
+        self.capacity = queries_per_100s
+        self.tokens = queries_per_100s
+        self.daily_quota = daily_quota
+        self.day_start = None
+        self.day_count = 0
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Take a token, sleeping until one is available, and return the
+        number of seconds slept. Raise an error if the daily quota is
+        used up."""
+        with self.lock:
+            now = time.monotonic()
+            if self.daily_quota is not None:
+                if self.day_start is None or now - self.day_start >= 86400:
+                    self.day_start = now
+                    self.day_count = 0
+                if self.day_count >= self.daily_quota:
+                    raise Exception('Daily quota of {} requests reached, '
+                                    'see set_serp_rate_limit'
+                                    .format(self.daily_quota))
+                self.day_count += 1
+            if self.rate is None:
+                return 0.0
+            self.tokens = min(self.capacity,
+                              self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+def _rate_limiter(key):
+    """Return the rate limiter shared by all requests made with ``key``."""
+    with _rate_limiters_lock:
+        if key not in _rate_limiters:
+            _rate_limiters[key] = _TokenBucket(_QUERIES_PER_100S,
+                                               _DAILY_QUOTA)
+        return _rate_limiters[key]
+
+
+def _count(stat, value=1):
+    with _rate_stats_lock:
+        _rate_stats[stat] += value
+
+
+def _is_retryable(status_code, body):
+    """Whether a failed request should be retried: server errors, and
+    rate limit errors, which Google APIs return as 429 or 403."""
+    if status_code in _RETRY_STATUSES:
+        return True
+    if status_code == 403 and isinstance(body, dict):
+        error = body.get('error')
+        errors = error.get('errors') if isinstance(error, dict) else None
+        if not isinstance(errors, list):
+            return False
+        return any(isinstance(e, dict) and
+                   e.get('reason') in _RATE_LIMIT_REASONS for e in errors)
+    return False
+
+
+def _retry_after(resp):
+    """Return the seconds to wait from the ``Retry-After`` header of
+    ``resp``, given in seconds or as an HTTP date, or None if it's missing
+    or invalid."""
+    value = getattr(resp, 'headers', {}).get('Retry-After')
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    now = datetime.datetime.now(tz=retry_at.tzinfo)
+    return max((retry_at - now).total_seconds(), 0.0)
+
+
+def _backoff_delay(attempt, resp=None):
+    """Return the seconds to wait before retry number ``attempt`` (from
+    zero): the ``Retry-After`` header of ``resp`` if it has one, otherwise
+    exponential, with random jitter so concurrent requests don't retry all
+    at once."""
+    retry_after = _retry_after(resp) if resp is not None else None
+    if retry_after is not None:
+        return retry_after
+    return _BACKOFF * 2 ** attempt + random.uniform(0, _BACKOFF)
+
+
+def set_serp_rate_limit(queries_per_100s=None, daily_quota=None,
+                        max_retries=3, backoff=1.0):
+    """Change how :func:`serp_goog`, :func:`serp_youtube` and the YouTube
+    details functions pace their requests, and retry failed ones.
+
+    Limits apply to each API key, shared by all the functions and threads
+    using it. Responses read from the cache don't count.
+
+    :param queries_per_100s: The maximum number of requests per 100
+        seconds, as in the API's quota page. Requests wait until they are
+        allowed. Defaults to None, no limit.
+    :param daily_quota: The maximum number of requests per 24 hours. Once
+        reached, requests raise an error instead of using more quota.
+        Defaults to None, no limit.
+    :param max_retries: The number of times to retry requests that fail
+        with a rate limit error or a server error (429, 5xx), defaults to 3.
+        Other errors are raised right away.
+    :param backoff: The seconds to wait before the first retry, doubled for
+        each one after it, plus a random jitter of up to ``backoff``.
+        Defaults to 1. If the API sends a ``Retry-After`` header, its delay
+        is used instead.
+    """
+    global _QUERIES_PER_100S, _DAILY_QUOTA, _MAX_RETRIES, _BACKOFF
+    for name, value in [('queries_per_100s', queries_per_100s),
+                        ('daily_quota', daily_quota)]:
+        if value is not None and (not isinstance(value, int) or value < 1):
+            raise ValueError('Please make sure {} is None or a positive '
+                             'integer'.format(name))
+    if not isinstance(max_retries, int) or max_retries < 0:
+        raise ValueError('Please make sure max_retries is a non-negative '
+                         'integer')
+    if backoff < 0:
+        raise ValueError('Please make sure backoff is non-negative')
+    with _rate_limiters_lock:
+        _QUERIES_PER_100S = queries_per_100s
+        _DAILY_QUOTA = daily_quota
+        _MAX_RETRIES = max_retries
+        _BACKOFF = backoff
+        _rate_limiters.clear()
+
+
+def serp_rate_limit_stats(reset=False):
+    """Return counters of the requests made by the serp functions, as a
+    dict with the keys:
+
+    * requests: requests sent to the API, including retries
+    * retries: requests that were retried after failing
+    * throttled_seconds: time spent waiting for the rate limit
+    * backoff_seconds: time spent waiting before retries
+
+    :param reset: Whether to set the counters back to zero.
+    """
+    with _rate_stats_lock:
+        stats = dict(_rate_stats)
+        if reset:
+            _rate_stats.update(requests=0, retries=0, throttled_seconds=0.0,
+                               backoff_seconds=0.0)
+    return stats
+
+
+def _new_session(pool_maxsize=10):
+    """Return a ``requests.Session`` that keeps up to ``pool_maxsize``
+    connections alive per host, and accepts compressed responses."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({'Accept-Encoding': 'gzip, deflate'})
+    return session
+
+
+def _get_session():
+    """Return the session shared by all requests of this module, creating
+    it on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = _new_session()
+        return _session
+
+
+def set_serp_session(session=None, pool_maxsize=10):
+    """Change the ``requests.Session`` used by :func:`serp_goog`,
+    :func:`serp_youtube` and the YouTube details functions, unless one is
+    passed to them with the ``session`` parameter.
+
+    Connections are reused across requests, which saves a new TLS handshake
+    for each one.
+
+    :param session: A ``requests.Session`` (for example with custom proxies,
+        headers, or retries), or None to create a new default session.
+    :param pool_maxsize: The number of connections to keep alive for the
+        API's host, used if ``session`` is None. Set it at least as high as
+        the ``max_workers`` you use.
+    """
+    global _session
+    with _session_lock:
+        _session = session if session is not None else _new_session(
+            pool_maxsize)
+
+
+def _parse_json(content):
+    """Decode the JSON body ``content`` (bytes) of a response, with orjson
+    if it's installed."""
+    return _json_loads(content)
+
+
+def _cache_key(base_url, param):
+    """Return the cache key of a request, ignoring the API key."""
+    param = {k: v for k, v in param.items() if k != 'key'}
+    request = json.dumps([base_url, param], sort_keys=True, default=str)
+    return hashlib.sha256(request.encode()).hexdigest()
+
+
+def _cache_connect(cache):
+    """Return a connection to the SQLite cache file ``cache``, creating its
+    table if needed. WAL mode lets several processes read and write the
+    cache at the same time."""
+    conn = sqlite3.connect(cache, timeout=60)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('CREATE TABLE IF NOT EXISTS responses '
+                 '(key TEXT PRIMARY KEY, created REAL, body BLOB)')
+    return conn
+
+
+def _cache_get(cache, key, cache_ttl):
+    """Return the parsed body of the cached response for ``key`` if it's
+    newer than ``cache_ttl`` seconds, otherwise None."""
+    conn = _cache_connect(cache)
+    try:
+        row = conn.execute('SELECT created, body FROM responses '
+                           'WHERE key = ?', (key,)).fetchone()
+    finally:
+        conn.close()
+    if row is None:
+        return None
+    created, body = row
+    if cache_ttl is not None and time.time() - created > cache_ttl:
+        return None
+    return _parse_json(gzip.decompress(body))
+
+
+def _cache_put(cache, key, content):
+    """Save the body of a successful response to the cache."""
+    conn = _cache_connect(cache)
+    try:
+        with conn:
+            conn.execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?)',
+                         (key, time.time(), gzip.compress(content)))
+    finally:
+        conn.close()
+
+
+def _atomic_write(path, data):
+    """Write the bytes ``data`` to ``path`` through a temporary file in the
+    same directory, so ``path`` is either complete or doesn't exist."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.',
+                                    suffix='.tmp')
+    try:
+        with open(fd, 'wb') as tmp:
+            tmp.write(data)
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def _job_manifest(job_dir):
+    """Return the completed requests of the job in ``job_dir``, a dict of
+    request keys to the files of their results. A last entry that was only
+    partly written is removed from the manifest, and entries whose file is
+    missing are skipped, so they are requested again."""
+    path = os.path.join(job_dir, _JOB_MANIFEST)
+    done = {}
+    if not os.path.exists(path):
+        return done
+    with open(path, 'r+b') as manifest:
+        lines = manifest.read().split(b'\n')
+        if lines[-1]:
+            manifest.truncate(sum(len(line) + 1 for line in lines[:-1]))
+    for line in lines[:-1]:
+        try:
+            entry = json.loads(line.decode('utf-8'))
+        except ValueError:
+            continue
+        if os.path.exists(os.path.join(job_dir, entry['file'])):
+            done[entry['key']] = entry['file']
+    return done
+
+
+def _job_save(job_dir, key, param, resp):
+    """Save the parsed response ``resp`` of the request ``param`` with the
+    time it was received, then record it in the job's manifest. Return
+    the name of its file."""
+    filename = key + '.json.gz'
+    result = {'queryTime': time.time(), 'response': resp}
+    _atomic_write(os.path.join(job_dir, filename),
+                  gzip.compress(json.dumps(result).encode('utf-8')))
+    entry = {'key': key, 'file': filename,
+             'params': {k: v for k, v in param.items() if k != 'key'}}
+    with open(os.path.join(job_dir, _JOB_MANIFEST), 'at',
+              encoding='utf-8') as manifest:
+        manifest.write(json.dumps(entry, default=str) + '\n')
+        manifest.flush()
+        os.fsync(manifest.fileno())
+    return filename
+
+
+def _job_load(job_dir, filename):
+    """Return the parsed response saved in ``filename``, and the time it
+    was received."""
+    with open(os.path.join(job_dir, filename), 'rb') as result_file:
+        result = _parse_json(gzip.decompress(result_file.read()))
+    query_time = datetime.datetime.fromtimestamp(result['queryTime'],
+                                                 tz=datetime.timezone.utc)
+    return result['response'], query_time
+
+
+def _get_response(base_url, param, description=None, session=None,
+                  cache=None, cache_ttl=None):
+    """Request ``base_url`` with ``param`` and return its parsed JSON body,
+    decoded only once, or raise the API's error if the request fails.
+    ``description`` is logged instead of ``param`` if given. Uses the
+    module's shared session unless ``session`` is given. If ``cache`` is
+    given, successful responses are saved to it, and responses newer than
+    ``cache_ttl`` seconds are read from it instead of making the request.
+    Requests are paced and retried according to
+    :func:`set_serp_rate_limit`."""
+    if description is None:
+        description = ', '.join([k + '=' + str(v) for k, v in param.items()
+                                 if k != 'key'])
+    if cache is not None:
+        key = _cache_key(base_url, param)
+        cached = _cache_get(cache, key, cache_ttl)
+        if cached is not None:
+            logging.info(msg='From cache: ' + description)
+            return cached
+    if session is None:
+        session = _get_session()
+    logging.info(msg='Requesting: ' + description)
+    attempt = 0
+    while True:
+        _count('throttled_seconds', _rate_limiter(param.get('key')).acquire())
+        with _key_semaphore(param.get('key')):
+            resp = session.get(base_url, params=param)
+        _count('requests')
+        if resp.status_code < 400:
+            body = _parse_json(resp.content)
+            break
+        try:
+            body = _parse_json(resp.content)
+        except ValueError:
+            body = resp.content
+        if attempt >= _MAX_RETRIES or not _is_retryable(resp.status_code,
+                                                        body):
+            raise Exception(body)
+        delay = _backoff_delay(attempt, resp)
+        logging.warning(msg='Retrying in {:.1f}s ({}): {}'.format(
+            delay, resp.status_code, description))
+        _count('retries')
+        _count('backoff_seconds', delay)
+        time.sleep(delay)
+        attempt += 1
+    if cache is not None:
+        _cache_put(cache, key, resp.content)
+    return body
+
+
+def _get_responses(base_url, params_list, max_workers=None,
+                   **request_options):
+    """Request ``base_url`` once for each of ``params_list``, concurrently
+    if ``max_workers`` is more than one, and return the parsed responses in
+    the same order as ``params_list``. ``request_options`` are passed to
+    :func:`_get_response`."""
+    get_response = partial(_get_response, base_url, **request_options)
+    if max_workers is None or max_workers <= 1 or len(params_list) < 2:
+        return [get_response(param) for param in params_list]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(get_response, params_list))
+
+
+def _iter_responses(base_url, params_list, max_workers=None,
+                    **request_options):
+    """Like :func:`_get_responses`, but yield each parameter dict with its
+    parsed response as soon as it arrives, in the order the requests
+    complete. At most ``max_workers * 2`` requests are in flight or waiting
+    to be yielded, and responses aren't kept after they're yielded."""
+    get_response = partial(_get_response, base_url, **request_options)
+    if max_workers is None or max_workers <= 1 or len(params_list) < 2:
+        for param in params_list:
+            yield param, get_response(param)
+        return
+    params = iter(params_list)
+    futures = {}
+    done = set()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            while True:
+                for param in islice(params, max_workers * 2 - len(futures)):
+                    futures[executor.submit(get_response, param)] = param
+                if not futures:
+                    return
+                if not done:
+                    done = wait(futures, return_when=FIRST_COMPLETED)[0]
+                yield _pop_result(futures, done)
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def _pop_result(futures, done):
+    """Remove a finished future from ``futures`` and ``done``, and return
+    its parameter dict with its result, without keeping a reference to
+    either."""
+    future = done.pop()
+    return futures.pop(future), future.result()
+
+
+def _normalize_rows(values):
+    """Flatten each of ``values`` (a dict, or a list of dicts) into rows of
+    one DataFrame, normalizing them all at once. Missing values get an
+    empty row."""
+    records = []
+    for value in values:
+        if isinstance(value, dict):
+            records.append(value)
+        elif isinstance(value, list):
+            records.extend(value)
+        else:
+            records.append({})
+    return json_normalize(records)
 
 
 def _dict_product(d):
@@ -487,6 +999,112 @@ def _dict_product(d):
     return dicts
 
 
+_SERP_GOOG_URL = 'https://www.googleapis.com/customsearch/v1?'
+
+_SERP_GOOG_SPECIFIED_COLS = ['searchTerms', 'rank', 'title', 'snippet',
+                             'displayLink', 'link', 'queryTime',
+                             'totalResults']
+
+
+def _serp_goog_params_list(params):
+    """Validate the parameters of :func:`serp_goog` given in ``params``
+    (its ``locals()``), and return all their combinations, one dict per
+    request."""
+    supplied_params = {k: v for k, v in params.items()
+                       if params[k] and k not in _SERP_OPTIONS}
+
+    for p in supplied_params:
+        if isinstance(supplied_params[p], (str, int)):
+            supplied_params[p] = [supplied_params[p]]
+
+    for p in supplied_params:
+        if p in SERP_GOOG_VALID_VALS:
+            if not set(supplied_params[p]).issubset(SERP_GOOG_VALID_VALS[p]):
+                raise ValueError('Please make sure you provide a'
+                                 ' valid value for "{}", valid values:\n'
+                                 '{}'.format(p,
+                                             sorted(SERP_GOOG_VALID_VALS[p])))
+    return _dict_product(supplied_params)
+
+
+def _serp_goog_frame(resp, query_time=None):
+    """Return the DataFrame of the parsed response ``resp`` of one
+    request, received at ``query_time`` (defaults to now)."""
+    request_metadata = resp['queries']['request'][0]
+    del request_metadata['title']
+    search_info = resp['searchInformation']
+    if int(search_info['totalResults']) == 0:
+        df = pd.DataFrame(columns=_SERP_GOOG_SPECIFIED_COLS, index=range(1))
+        df['searchTerms'] = request_metadata['searchTerms']
+    else:
+        df = pd.DataFrame(resp['items'])
+        df['cseName'] = resp['context']['title']
+        start_idx = request_metadata['startIndex']
+        df['rank'] = range(start_idx, start_idx + len(df))
+
+    meta_columns = {**request_metadata, **search_info}
+    df = df.assign(**meta_columns)
+    if query_time is None:
+        query_time = datetime.datetime.now(tz=datetime.timezone.utc)
+    df['queryTime'] = query_time
+    df['queryTime'] = pd.to_datetime(df['queryTime'])
+    if 'image' in df:
+        img_df = json_normalize(df['image'])
+        img_df.columns = ['image.' + c for c in img_df.columns]
+        df = pd.concat([df, img_df], axis=1)
+    return df
+
+
+def _serp_goog_finalize(result_df, param):
+    """Order the columns of ``result_df``, with the parameters of
+    ``param`` first, and expand its ``pagemap`` and metatags columns."""
+    ordered_cols = (list(set(param).difference({'q', 'key', 'cx'})) +
+                    _SERP_GOOG_SPECIFIED_COLS)
+    non_ordered = result_df.columns.difference(set(ordered_cols))
+    final_df = result_df[ordered_cols + list(non_ordered)]
+    if 'pagemap' in final_df:
+        pagemap_df = _normalize_rows(final_df['pagemap'])
+        for col in pagemap_df:
+            if col in final_df:
+                pagemap_df = pagemap_df.rename(columns={col: 'pagemap_' + col})
+        final_df = pd.concat([final_df, pagemap_df], axis=1)
+
+        if 'metatags' in pagemap_df:
+            metatag_df = _normalize_rows(pagemap_df['metatags'])
+            for col in metatag_df:
+                if col in final_df:
+                    metatag_df = metatag_df.rename(columns={col: 'metatag_' + col})
+
+            final_df = pd.concat([final_df, metatag_df], axis=1)
+    return final_df
+
+
+def _serp_goog_job(params_list, job_dir, max_workers=None,
+                   **request_options):
+    """Request the combinations of ``params_list`` that aren't completed in
+    ``job_dir`` yet, saving each result as soon as it arrives, and return
+    the frames of all of them in the order of ``params_list``. Responses
+    are released once saved, and the frames are built from the saved
+    files."""
+    os.makedirs(job_dir, exist_ok=True)
+    done = _job_manifest(job_dir)
+    keys = [_cache_key(_SERP_GOOG_URL, param) for param in params_list]
+    missing = [param for param, key in zip(params_list, keys)
+               if key not in done]
+    if len(missing) < len(params_list):
+        logging.info(msg='Resuming job: {} of {} requests already '
+                         'done'.format(len(params_list) - len(missing),
+                                       len(params_list)))
+    responses = _iter_responses(_SERP_GOOG_URL, missing, max_workers,
+                                **request_options)
+    for param, resp in responses:
+        key = _cache_key(_SERP_GOOG_URL, param)
+        done[key] = _job_save(job_dir, key, param, resp)
+        del resp
+    return [_serp_goog_frame(*_job_load(job_dir, done[key]))
+            for key in keys]
+
+
 def serp_goog(q, cx, key, c2coff=None, cr=None,
               dateRestrict=None, exactTerms=None, excludeTerms=None,
               fileType=None, filter=None, gl=None, highRange=None,
@@ -494,7 +1112,8 @@ def serp_goog(q, cx, key, c2coff=None, cr=None,
               imgSize=None, imgType=None, linkSite=None, lowRange=None,
               lr=None, num=None, orTerms=None, relatedSite=None,
               rights=None, safe=None, searchType=None, siteSearch=None,
-              siteSearchFilter=None, sort=None, start=None):
+              siteSearchFilter=None, sort=None, start=None, max_workers=None,
+              session=None, cache=None, cache_ttl=86400, job_dir=None):
     """Query Google and get search results in a DataFrame.
 
     For each parameter, you can supply single or multiple values / arguments.
@@ -630,6 +1249,28 @@ def serp_goog(q, cx, key, c2coff=None, cr=None,
         100 documents match the query, so setting (start + num) to
         more than 100 will produce an error. Note that the maximum
         value for num is 10.
+    :param max_workers: The number of requests to make concurrently, in
+        threads. Defaults to None, one request at a time. At most ten
+        requests per API key are made at the same time, which can be
+        changed with :func:`set_max_in_flight_per_key`. Results are in the
+        same order either way.
+    :param session: A ``requests.Session`` to make the requests with.
+        Defaults to None, a session shared by all calls, which keeps
+        connections alive (see :func:`set_serp_session`).
+    :param cache: The path of an SQLite file to cache responses in. Defaults
+        to None, no caching. Responses are stored compressed, and looked up
+        by the request's parameters (except ``key``), so running the same
+        queries again doesn't use the API's quota. The same file can be used
+        by several processes at the same time.
+    :param cache_ttl: The number of seconds for which cached responses are
+        used, defaults to 86400 (one day). None to use them regardless of
+        their age.
+    :param job_dir: The path of a directory to save the results of the job
+        in, as each request completes. Defaults to None, results are only
+        kept in memory. If a request fails partway through a job, running
+        the same call again requests only the combinations that aren't in
+        ``job_dir`` yet, and returns the full DataFrame, with each result's
+        original ``queryTime``.
 
     The following function call will produce two queries:
     "hotel" in the USA, and "hotel" in France
@@ -647,98 +1288,65 @@ def serp_goog(q, cx, key, c2coff=None, cr=None,
     >>> serp_goog(q=['flights', 'tickets'], cr=['countryUK', 'countryAU'],
                   cx='YOUR_CX', key='YOUR_KEY')
     """
-    params = locals()
-    supplied_params = {k: v for k, v in params.items() if params[k]}
-
-    for p in supplied_params:
-        if isinstance(supplied_params[p], (str, int)):
-            supplied_params[p] = [supplied_params[p]]
-
-    for p in supplied_params:
-        if p in SERP_GOOG_VALID_VALS:
-            if not set(supplied_params[p]).issubset(SERP_GOOG_VALID_VALS[p]):
-                raise ValueError('Please make sure you provide a'
-                                 ' valid value for "{}", valid values:\n'
-                                 '{}'.format(p,
-                                             sorted(SERP_GOOG_VALID_VALS[p])))
-    params_list = _dict_product(supplied_params)
-    base_url = 'https://www.googleapis.com/customsearch/v1?'
-    specified_cols = ['searchTerms', 'rank', 'title', 'snippet',
-                      'displayLink', 'link', 'queryTime', 'totalResults']
-    responses = []
-    for param in params_list:
-        param_log = ', '.join([k + '=' + str(v) for k, v in param.items()])
-        logging.info(msg='Requesting: ' + param_log)
-        resp = requests.get(base_url, params=param)
-        if resp.status_code >= 400:
-            raise Exception(resp.json())
-        responses.append(resp)
-    result_df = pd.DataFrame()
-    for i, resp in enumerate(responses):
-        request_metadata = resp.json()['queries']['request'][0]
-        del request_metadata['title']
-        search_info = resp.json()['searchInformation']
-        if int(search_info['totalResults']) == 0:
-            df = pd.DataFrame(columns=specified_cols, index=range(1))
-            df['searchTerms'] = request_metadata['searchTerms']
-        else:
-            df = pd.DataFrame(resp.json()['items'])
-            df['cseName'] = resp.json()['context']['title']
-            start_idx = request_metadata['startIndex']
-            df['rank'] = range(start_idx, start_idx + len(df))
-
-        meta_columns = {**request_metadata, **search_info}
-        df = df.assign(**meta_columns)
-        df['queryTime'] = datetime.datetime.now(tz=datetime.timezone.utc)
-        df['queryTime'] = pd.to_datetime(df['queryTime'])
-        if 'image' in df:
-            img_df = json_normalize(df['image'])
-            img_df.columns = ['image.' + c for c in img_df.columns]
-            df = pd.concat([df, img_df], axis=1)
-        result_df = result_df.append(df, sort=False, ignore_index=True)
-    ordered_cols = (list(set(params_list[i]).difference({'q', 'key', 'cx'})) +
-                    specified_cols)
-    non_ordered = result_df.columns.difference(set(ordered_cols))
-    final_df = result_df[ordered_cols + list(non_ordered)]
-    if 'pagemap' in final_df:
-        pagemap_df = pd.DataFrame()
-        for p in final_df['pagemap']:
-            try:
-                temp_pagemap_df = json_normalize(p)
-                pagemap_df = pagemap_df.append(temp_pagemap_df, sort=False)
-            except Exception as e:
-                temp_pagemap_df = pd.DataFrame({'delete_me': None},
-                                                index=range(1))
-                pagemap_df = pagemap_df.append(temp_pagemap_df, sort=False)
-        pagemap_df = pagemap_df.reset_index(drop=True)
-        if 'delete_me' in pagemap_df:
-            del pagemap_df['delete_me']
-        for col in pagemap_df:
-            if col in final_df:
-                pagemap_df = pagemap_df.rename(columns={col: 'pagemap_' + col})
-        final_df = pd.concat([final_df, pagemap_df], axis=1)
+    params_list = _serp_goog_params_list(locals())
+    if job_dir is not None:
+        frames = _serp_goog_job(params_list, job_dir, max_workers,
+                                session=session, cache=cache,
+                                cache_ttl=cache_ttl)
+    else:
+        responses = _get_responses(_SERP_GOOG_URL, params_list, max_workers,
+                                   session=session, cache=cache,
+                                   cache_ttl=cache_ttl)
+        frames = [_serp_goog_frame(resp) for resp in responses]
+    result_df = pd.concat(frames, sort=False, ignore_index=True)
+    return _serp_goog_finalize(result_df, params_list[-1])
+
+
+def serp_goog_iter(q, cx, key, c2coff=None, cr=None,
+                   dateRestrict=None, exactTerms=None, excludeTerms=None,
+                   fileType=None, filter=None, gl=None, highRange=None,
+                   hl=None, hq=None, imgColorType=None, imgDominantColor=None,
+                   imgSize=None, imgType=None, linkSite=None, lowRange=None,
+                   lr=None, num=None, orTerms=None, relatedSite=None,
+                   rights=None, safe=None, searchType=None, siteSearch=None,
+                   siteSearchFilter=None, sort=None, start=None,
+                   max_workers=None, session=None, cache=None,
+                   cache_ttl=86400, on_result=None):
+    """Query Google and yield the search results of each request in its own
+    DataFrame, as soon as the request completes.
+
+    Takes the same parameters as :func:`serp_goog`, which returns all the
+    results at once. Each response is turned into a DataFrame when it
+    arrives and isn't kept afterwards, so memory doesn't grow with the
+    number of requests, and results can be used (or saved) before the whole
+    job is done. With ``max_workers``, DataFrames are yielded in the order
+    their requests complete, which might differ from the order of the
+    parameter combinations.
+
+    :param on_result: A function to call with each DataFrame before it's
+        yielded, for example to append it to a file or a database table.
+
+    >>> for df in serp_goog_iter(q=['flights', 'tickets'], gl=['us', 'uk'],
+    ...                          cx='YOUR_CX', key='YOUR_KEY',
+    ...                          on_result=lambda df: df.to_csv(
+    ...                              'serp.csv', mode='a', header=False)):
+    ...     print(df['searchTerms'][0], df['gl'][0], len(df))
+    """
+    params_list = _serp_goog_params_list(locals())
+    responses = _iter_responses(_SERP_GOOG_URL, params_list, max_workers,
+                                session=session, cache=cache,
+                                cache_ttl=cache_ttl)
+    return _serp_goog_iter_frames(responses, on_result)
 
-        if 'metatags' in pagemap_df:
-            metatag_df = pd.DataFrame()
-            for m in pagemap_df['metatags']:
-                try:
-                    temp_metatags_df = json_normalize(m)
-                    metatag_df = metatag_df.append(temp_metatags_df,
-                                                   sort=False)
-                except Exception as e:
-                    temp_metatags_df = pd.DataFrame({'delete_me': None},
-                                                    index=range(1))
-                    metatag_df = metatag_df.append(temp_metatags_df,
-                                                   sort=False)
-            metatag_df = metatag_df.reset_index(drop=True)
-            if 'delete_me' in metatag_df:
-                del metatag_df['delete_me']
-            for col in metatag_df:
-                if col in final_df:
-                    metatag_df = metatag_df.rename(columns={col: 'metatag_' + col})
 
-            final_df = pd.concat([final_df, metatag_df], axis=1)
-    return final_df
+def _serp_goog_iter_frames(responses, on_result=None):
+    """Yield the DataFrame of each of ``responses``, (param, response)
+    pairs, after passing it to ``on_result`` if given."""
+    for param, resp in responses:
+        df = _serp_goog_finalize(_serp_goog_frame(resp), param)
+        if on_result is not None:
+            on_result(df)
+        yield df
 
 
 def serp_youtube(key, q=None, channelId=None, channelType=None, eventType=None,
@@ -750,7 +1358,9 @@ def serp_youtube(key, q=None, channelId=None, channelType=None, eventType=None,
                  safeSearch=None, topicId=None, type=None, videoCaption=None,
                  videoCategoryId=None, videoDefinition=None,
                  videoDimension=None, videoDuration=None, videoEmbeddable=None,
-                 videoLicense=None, videoSyndicated=None, videoType=None):
+                 videoLicense=None, videoSyndicated=None, videoType=None,
+                 max_workers=None, session=None, cache=None,
+                 cache_ttl=86400):
     """Query the YouTube API and get search results in a DataFrame.
     For each parameter you can supply a single or multiple value(s).
     Looping and merging results is handled automatically in case of multiple
@@ -1062,9 +1672,26 @@ def serp_youtube(key, q=None, channelId=None, channelType=None, eventType=None,
         episode – Only retrieve episodes of shows.
 
         movie – Only retrieve movies.
+    :param max_workers: The number of requests to make concurrently, in
+        threads. Defaults to None, one request at a time. At most ten
+        requests per API key are made at the same time, which can be
+        changed with :func:`set_max_in_flight_per_key`. Results are in the
+        same order either way.
+    :param session: A ``requests.Session`` to make the requests with.
+        Defaults to None, a session shared by all calls, which keeps
+        connections alive (see :func:`set_serp_session`).
+    :param cache: The path of an SQLite file to cache responses in. Defaults
+        to None, no caching. Responses are stored compressed, and looked up
+        by the request's parameters (except ``key``), so running the same
+        queries again doesn't use the API's quota. The same file can be used
+        by several processes at the same time.
+    :param cache_ttl: The number of seconds for which cached responses are
+        used, defaults to 86400 (one day). None to use them regardless of
+        their age.
     """
     params = locals()
-    supplied_params = {k: v for k, v in params.items() if params[k]}
+    supplied_params = {k: v for k, v in params.items()
+                       if params[k] and k not in _SERP_OPTIONS}
 
     type_vid_params = {'eventType', 'relatedToVideoId', 'videoCaption',
                        'videoCategoryId', 'videoDefinition', 'videoDimension',
@@ -1093,19 +1720,14 @@ def serp_youtube(key, q=None, channelId=None, channelType=None, eventType=None,
     params_list = _dict_product(supplied_params)
     base_url = "https://www.googleapis.com/youtube/v3/search?part=snippet"
 
-    responses = []
-    for param in params_list:
-        param_log = ', '.join([k + '=' + str(v) for k, v in param.items()])
-        logging.info(msg='Requesting: ' + param_log)
-        resp = requests.get(base_url, params=param)
-        if resp.status_code >= 400:
-            raise Exception(resp.json())
-        responses.append(resp)
+    responses = _get_responses(base_url, params_list, max_workers,
+                               session=session, cache=cache,
+                               cache_ttl=cache_ttl)
 
-    result_df = pd.DataFrame()
+    frames = []
     for i, resp in enumerate(responses):
-        snippet_df = pd.DataFrame([x['snippet'] for x in resp.json()['items']])
-        id_df = pd.DataFrame([x['id'] for x in resp.json()['items']])
+        snippet_df = pd.DataFrame([x['snippet'] for x in resp['items']])
+        id_df = pd.DataFrame([x['id'] for x in resp['items']])
         if 'channelId' in id_df:
             id_df = id_df.drop('channelId', axis=1)
 
@@ -1113,7 +1735,7 @@ def serp_youtube(key, q=None, channelId=None, channelType=None, eventType=None,
             thumb_df = json_normalize(snippet_df['thumbnails'])
         else:
             thumb_df = pd.DataFrame()
-        page_info = resp.json()['pageInfo']
+        page_info = resp['pageInfo']
         temp_df = pd.concat([snippet_df, id_df, thumb_df],
                             axis=1).assign(**page_info)
         temp_df['rank'] = range(1, len(temp_df)+1)
@@ -1127,9 +1749,9 @@ def serp_youtube(key, q=None, channelId=None, channelType=None, eventType=None,
             temp_df = temp_df.assign(**page_info)
         del params_list[i]['key']
         temp_df = temp_df.assign(**params_list[i])
-        temp_df['nextPageToken'] = resp.json().get('nextPageToken')
-        result_df = result_df.append(temp_df, sort=False,
-                                     ignore_index=True)
+        temp_df['nextPageToken'] = resp.get('nextPageToken')
+        frames.append(temp_df)
+    result_df = pd.concat(frames, sort=False, ignore_index=True)
 
     result_df['queryTime'] = datetime.datetime.now(tz=datetime.timezone.utc)
     result_df['queryTime'] = pd.to_datetime(result_df['queryTime'])
@@ -1143,7 +1765,9 @@ def serp_youtube(key, q=None, channelId=None, channelType=None, eventType=None,
 
     vid_ids = ','.join(final_df['videoId'].dropna())
     if vid_ids:
-        vid_details_df = youtube_video_details(vid_ids=vid_ids, key=key)
+        vid_details_df = youtube_video_details(vid_ids=vid_ids, key=key,
+                                               session=session, cache=cache,
+                                               cache_ttl=cache_ttl)
         vid_details_df.columns = ['video.' + x for x in vid_details_df.columns]
         final_df = pd.merge(final_df, vid_details_df,
                             how='left', left_on='videoId', right_on='video.id')
@@ -1151,7 +1775,10 @@ def serp_youtube(key, q=None, channelId=None, channelType=None, eventType=None,
     channel_ids = ','.join(final_df['channelId'].dropna())
     if channel_ids:
         channel_details_df = youtube_channel_details(channel_ids=channel_ids,
-                                                     key=key)
+                                                     key=key,
+                                                     session=session,
+                                                     cache=cache,
+                                                     cache_ttl=cache_ttl)
         channel_details_df.columns = ['channel.' + x for x in
                                       channel_details_df.columns]
 
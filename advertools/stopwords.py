@@ -6,30 +6,61 @@ Copyright (C) 2016 ExplosionAI UG (haftungsbeschränkt), 2016 spaCy GmbH,
 List of stopwords useful in text mining, analyzing content of tweets, web
 pages, keywords, etc.
 
-Each list is accessible as part of a dictionary `stopwords` which is a normal
-Python dictionary.
+Each list is accessible as part of a dictionary-like object `stopwords`.
+The words of each language are only loaded the first time the language is
+accessed, as a frozenset.
 
 >>> import advertools as adv
->>> adv.stopwords['english'][:5]
-["a", "about", "above", "across", "after"]
+>>> sorted(adv.stopwords['english'])[:5]
+['a', 'about', 'above', 'across', 'after']
 
->>> adv.stopwords['german'][:5]
-["a", "ab", "aber", "ach", "acht"]
+>>> sorted(adv.stopwords['german'])[:5]
+['a', 'ab', 'aber', 'ach', 'acht']
 
->>> adv.stopwords.keys()
-dict_keys(['arabic', 'azerbaijani', 'bengali', 'catalan', 'chinese',
+>>> list(adv.stopwords)
+['arabic', 'azerbaijani', 'bengali', 'catalan', 'chinese',
 'croatian', 'danish', 'dutch', 'english', 'finnish', 'french',
 'german', 'greek', 'hebrew', 'hindi', 'hungarian', 'indonesian',
 'irish', 'italian', 'japanese', 'kazakh', 'nepali', 'norwegian',
 'persian', 'polish', 'portuguese', 'romanian', 'russian', 'sinhala',
 'spanish', 'swedish', 'tagalog', 'tamil', 'tatar', 'telugu', 'thai',
-'turkish', 'ukrainian', 'urdu', 'vietnamese'])
+'turkish', 'ukrainian', 'urdu', 'vietnamese']
 """
+import ast
+from collections.abc import Mapping
 
-stopwords = dict(
 
+class _LazyStopwords(Mapping):
+    """Read-only mapping of language names to frozensets of stopwords.
+    Each language is parsed from its source text on first access."""
 
-arabic={
+    def __init__(self, raw):
+        self._raw = raw
+        self._loaded = {}
+
+    def __getitem__(self, language):
+        try:
+            return self._loaded[language]
+        except KeyError:
+            raw = self._raw[language]
+            words = frozenset(ast.literal_eval('{' + raw + '}'))
+            self._loaded[language] = words
+            return words
+
+    def __iter__(self):
+        return iter(self._raw)
+
+    def __len__(self):
+        return len(self._raw)
+
+    def __repr__(self):
+        return '<stopwords: {}>'.format(', '.join(self._raw))
+
+
+_STOPWORDS_RAW = dict(
+
+
+arabic='''
     "آل", "آه", "آها", "آي", "أبو", "أثناء", "أحد", "أصبح", "أضحى", "أف",
     "أقل", "أكثر", "ألا", "أم", "أما", "أمام", "أمسى", "أن", "أنا", "أنت",
     "أنتم", "أنتما", "أنتن", "أنه", "أنى", "أو", "أولئك", "أولاء", "أوه", "أي",
@@ -70,9 +101,9 @@ arabic={
     "ولعل", "ولقد", "ولكن", "ولم", "ولما", "ولماذا", "وله", "ولهذا", "ولو",
     "وليس", "وليست", "وما", "وماذا", "ومع", "ومن", "ومنها", "وهذا", "وهل",
     "وهو", "وهي", "يا", "يكون", "يلي", "يمكن", "يوم"
-},
+''',
 
-azerbaijani={
+azerbaijani='''
     "a", "ad", "altı", "altmış", "amma", "arasında", "artıq", "ay", "az",
     "bax", "belə", "bəli", "bəlkə", "beş", "bəy", "bəzən", "bəzi",
     "bilər", "bir", "biraz", "biri", "birşey", "biz", "bizim", "bizlər",
@@ -94,9 +125,9 @@ azerbaijani={
     "üçün", "var", "və", "xan", "xanım", "xeyr", "ya", "yalnız", "yaxşı",
     "yeddi", "yenə", "yəni", "yetmiş", "yox", "yoxdur", "yoxsa", "yüz",
     "zaman"
-},
+''',
 
-bengali={
+bengali='''
     "অতএব", "অথচ", "অথবা", "অনুযায়ী", "অনুযায়ী", "অনেক", "অনেকে", "অনেকেই",
     "অন্তত", "অন্য", "অবধি", "অবশ্য", "অর্থাৎ", "অর্ধভাগে", "আগামী", "আগে",
     "আগেই", "আছে", "আজ", "আদ্যভাগে", "আপনার", "আপনি", "আবার", "আমরা", "আমাকে",
@@ -148,9 +179,9 @@ bengali={
     "হল", "হলে", "হলেই", "হলেও", "হলো", "হাজার", "হিসাবে", "হিসেবে", "হৈতে",
     "হৈলে", "হোক", "হয়", "হয়তো", "হয়নি", "হয়ে", "হয়েই", "হয়েছিল", "হয়েছে",
     "হয়েছেন"
-},
+''',
 
-catalan={
+catalan='''
     "a", "abans", "ací", "ah", "així", "això", "al", "aleshores", "algun",
     "alguna", "algunes", "alguns", "alhora", "allà", "allí", "allò", "als",
     "altra", "altre", "altres", "amb", "ambdues", "ambdós", "anar", "ans",
@@ -184,9 +215,9 @@ catalan={
     "un", "una", "unes", "uns", "us", "va", "vaig", "vam", "van", "vas", "veu",
     "vosaltres", "vostra", "vostre", "vostres", "érem", "éreu", "és", "éssent",
     "últim", "ús"
-},
+''',
 
-chinese={
+chinese='''
     "!", '"', "#", "$", "%", "&", "'", "(", ")", "*", "+", ",", "-", "--", ".",
     "..", "...", "......", "...................", "./", ".一", ".数", ".日", "/",
     "//", "0", "1", "2", "3", "4", "5", "6", "7", "8", "9", ":", "://", "::",
@@ -345,9 +376,9 @@ chinese={
     "［⑦］", "［⑧］", "［⑨］", "［⑩］", "［＊］", "［－", "［］", "］", "］∧′＝［", "］［", "＿",
     "ａ］", "ｂ］", "ｃ］", "ｅ］", "ｆ］", "ｎｇ昉", "｛", "｛－", "｜", "｝", "｝＞", "～", "～±",
     "～＋", "￥"
-},
+''',
 
-croatian={
+croatian='''
     "a", "ah", "aha", "aj", "ako", "al", "ali", "arh", "au", "avaj", "bar",
     "baš", "bez", "bi", "bih", "bijah", "bijahu", "bijasmo", "bijaste",
     "bijaše", "bila", "bili", "bilo", "bio", "bismo", "biste", "biti", "brr",
@@ -388,9 +419,9 @@ croatian={
     "ćeš", "ću", "čijem", "čijim", "čijima", "šic", "šta", "štagod", "što",
     "štogod", "želeći", "željah", "željela", "željele", "željeli", "željelo",
     "željen", "željena", "željene", "željeni", "željenu", "željeo"
-},
+''',
 
-danish={
+danish='''
     "af", "aldrig", "alene", "alle", "allerede", "alligevel", "alt", "altid",
     "anden", "andet", "andre", "at", "bag", "begge", "blandt", "blev", "blive",
     "bliver", "burde", "bør", "da", "de", "dem", "den", "denne", "dens", "der",
@@ -417,9 +448,9 @@ danish={
     "sådan", "således", "temmelig", "tidligere", "til", "tilbage", "tit", "ud",
     "uden", "udover", "under", "undtagen", "var", "ved", "vi", "via", "vil",
     "ville", "vore", "vores", "vær", "være", "været", "øvrigt"
-},
+''',
 
-dutch={
+dutch='''
     "aan", "af", "al", "alles", "als", "altijd", "andere", "ben", "bij",
     "daar", "dan", "dat", "de", "der", "deze", "die", "dit", "doch", "doen",
     "door", "dus", "een", "eens", "en", "er", "ge", "geen", "geweest", "haar",
@@ -431,9 +462,9 @@ dutch={
     "van", "veel", "voor", "want", "waren", "was", "wat", "we", "wel", "werd",
     "wezen", "wie", "wij", "wil", "worden", "zal", "ze", "zei", "zelf", "zich",
     "zij", "zijn", "zo", "zonder", "zou"
-},
+''',
 
-english={
+english='''
     "a", "about", "above", "across", "after", "afterwards", "again", "against",
     "all", "almost", "alone", "along", "already", "also", "although", "always",
     "am", "among", "amongst", "amount", "an", "and", "another", "any",
@@ -473,9 +504,9 @@ english={
     "whether", "which", "while", "whither", "who", "whoever", "whole", "whom",
     "whose", "why", "will", "with", "within", "without", "would", "yet", "you",
     "your", "yours", "yourself", "yourselves"
-},
+''',
 
-finnish={
+finnish='''
     "aiemmin", "aika", "aikaa", "aikaan", "aikaisemmin", "aikaisin", "aikana",
     "aikoina", "aikoo", "aikovat", "aina", "ainakaan", "ainakin", "ainoa",
     "ainoat", "aiomme", "aion", "aiotte", "aivan", "ajan", "alas", "alemmas",
@@ -596,9 +627,9 @@ finnish={
     "yhteen", "yhteensä", "yhteydessä", "yhteyteen", "yhtä", "yhtäälle",
     "yhtäällä", "yhtäältä", "yhtään", "yhä", "yksi", "yksin", "yksittäin",
     "yleensä", "ylemmäs", "yli", "ylös", "ympäri", "älköön", "älä"
-},
+''',
 
-french={
+french='''
     "a", "abord", "absolument", "afin", "ah", "ai", "aie", "ailleurs", "ainsi",
     "ait", "allaient", "allo", "allons", "allô", "alors", "anterieur",
     "anterieure", "anterieures", "apres", "après", "as", "assez", "attendu",
@@ -680,9 +711,9 @@ french={
     "vont", "vos", "votre", "vous", "vous-mêmes", "vu", "vé", "vôtre",
     "vôtres", "zut", "à", "â", "ça", "ès", "étaient", "étais", "était",
     "étant", "été", "être", "ô"
-},
+''',
 
-german={
+german='''
     "a", "ab", "aber", "ach", "acht", "achte", "achten", "achter", "achtes",
     "ag", "alle", "allein", "allem", "allen", "aller", "allerdings", "alles",
     "allgemeinen", "als", "also", "am", "an", "andere", "anderen", "andern",
@@ -756,9 +787,9 @@ german={
     "zunächst", "zur", "zurück", "zusammen", "zwanzig", "zwar", "zwei",
     "zweite", "zweiten", "zweiter", "zweites", "zwischen", "á", "über",
     "überhaupt", "übrigens"
-},
+''',
 
-greek={
+greek='''
     "άλλα", "άλλες", "άλλη", "άλλην", "άλλης", "άλλο", "άλλοι", "άλλον",
     "άλλος", "άλλοτε", "άλλους", "άλλων", "άμα", "άμεσα", "άνευ", "άνω",
     "άξαφνα", "άρα", "άραγε", "έγιναν", "έγινε", "έγκαιρα", "έκανε", "έκαστα",
@@ -847,9 +878,9 @@ greek={
     "όπου", "όπως", "όσα", "όσες", "όση", "όσην", "όσης", "όσο", "όσοι",
     "όσον", "όσος", "όσου", "όσους", "όσων", "όταν", "ότι", "ότου", "όχι",
     "ύστερα", "ώσπου", "ώστε"
-},
+''',
 
-hebrew={
+hebrew='''
     "אבל", "או", "אולי", "אותה", "אותו", "אותי", "אותך", "אותם", "אותן",
     "אותנו", "אז", "אחר", "אחרות", "אחרי", "אחרים", "אחרת", "אי", "איזה",
     "איך", "אין", "איפה", "איתה", "איתו", "איתי", "איתך", "איתכם", "איתכן",
@@ -872,9 +903,9 @@ hebrew={
     "עצמנו", "פה", "רק", "ש", "שבגללה", "שבו", "שוב", "של", "שלה", "שלהם",
     "שלהן", "שלו", "שלי", "שלך", "שלכם", "שלכן", "שלנו", "שם", "תהיה", "תחת",
     "תכלית"
-},
+''',
 
-hindi={
+hindi='''
     "अंदर", "अत", "अदि", "अप", "अपना", "अपनि", "अपनी", "अपने", "अभि", "अभी",
     "आदि", "आप", "इंहिं", "इंहें", "इंहों", "इतयादि", "इत्यादि", "इन", "इनका",
     "इन्हीं", "इन्हें", "इन्हों", "इस", "इसका", "इसकि", "इसकी", "इसके",
@@ -899,9 +930,9 @@ hindi={
     "सकता", "सकते", "सबसे", "सभि", "सभी", "साथ", "साबुत", "साभ", "सारा", "से",
     "सो", "हि", "ही", "हुअ", "हुआ", "हुइ", "हुई", "हुए", "हे", "हें", "है",
     "हैं", "हो", "होता", "होति", "होती", "होते", "होना", "होने"
-},
+''',
 
-hungarian={
+hungarian='''
     "a", "abban", "ahhoz", "ahogy", "ahol", "aki", "akik", "akkor", "akár",
     "alatt", "amely", "amelyek", "amelyekben", "amelyeket", "amelyet",
     "amelynek", "ami", "amikor", "amit", "amolyan", "amíg", "annak", "arra",
@@ -929,9 +960,9 @@ hungarian={
     "vannak", "vele", "vissza", "viszont", "volna", "volt", "voltak", "voltam",
     "voltunk", "által", "általában", "át", "én", "éppen", "és", "így", "ön",
     "össze", "úgy", "új", "újabb", "újra", "ő", "őket"
-},
+''',
 
-indonesian={
+indonesian='''
     "ada", "adalah", "adanya", "adapun", "agak", "agaknya", "agar", "akan",
     "akankah", "akhir", "akhiri", "akhirnya", "aku", "akulah", "amat",
     "amatlah", "anda", "andalah", "antar", "antara", "antaranya", "apa",
@@ -1056,9 +1087,9 @@ indonesian={
     "ungkap", "ungkapnya", "untuk", "usah", "usai", "waduh", "wah", "wahai",
     "waktu", "waktunya", "walau", "walaupun", "wong", "yaitu", "yakin",
     "yakni", "yang"
-},
+''',
 
-irish={
+irish='''
     "a", "ach", "ag", "agus", "an", "aon", "ar", "arna", "as", "ba", "beirt",
     "bhúr", "caoga", "ceathair", "ceathrar", "chomh", "chuig", "chun", "cois",
     "céad", "cúig", "cúigear", "daichead", "dar", "de", "deich", "deichniúr",
@@ -1071,9 +1102,9 @@ irish={
     "siad", "sibh", "sinn", "sna", "sé", "sí", "tar", "thar", "thú", "triúr",
     "trí", "trína", "trínár", "tríocha", "tú", "um", "ár", "é", "éis", "í",
     "ó", "ón", "óna", "ónár"
-},
+''',
 
-italian={
+italian='''
     "a", "abbastanza", "abbia", "abbiamo", "abbiano", "abbiate", "accidenti",
     "ad", "adesso", "affinche", "agl", "agli", "ahime", "ahimè", "ai", "al",
     "alcuna", "alcuni", "alcuno", "all", "alla", "alle", "allo", "allora",
@@ -1155,9 +1186,9 @@ italian={
     "ulteriore", "ultimo", "un", "una", "uno", "uomo", "va", "vale", "vari",
     "varia", "varie", "vario", "verso", "vi", "via", "vicino", "visto", "vita",
     "voi", "volta", "volte", "vostra", "vostre", "vostri", "vostro"
-},
+''',
 
-japanese={
+japanese='''
     "あ", "あっ", "あまり", "あり", "ある", "あるいは", "あれ", "い", "いい", "いう", "いく", "いずれ",
     "いっ", "いつ", "いる", "いわ", "うち", "え", "お", "おい", "おけ", "および", "おら", "おり", "か",
     "かけ", "かつ", "かつて", "かなり", "から", "が", "き", "きっかけ", "くる", "くん", "こ", "こう",
@@ -1171,9 +1202,9 @@ japanese={
     "ほぼ", "ま", "ます", "また", "まで", "まま", "み", "も", "もう", "もっ", "もと", "もの", "や",
     "やっ", "よ", "よう", "よく", "よっ", "より", "よる", "よれ", "ら", "らしい", "られ", "られる",
     "る", "れ", "れる", "を", "ん", "一"
-},
+''',
 
-kazakh={
+kazakh='''
     "ах", "ох", "эх", "ай", "эй", "ой", "тағы", "тағыда", "әрине", "жоқ",
     "сондай", "осындай", "осылай", "солай", "мұндай", "бұндай", "мен",
     "сен", "ол", "біз", "біздер", "олар", "сіз", "сіздер", "маған",
@@ -1220,9 +1251,9 @@ kazakh={
     "кейін", "соң", "бұрын", "бетер", "қатар", "бірге", "қоса", "шейін",
     "дейін", "қарай", "таман", "салым", "тарта", "жуық", "таяу", "арнайы",
     "осындай", "ғана", "қана", "тек", "әншейін"
-},
+''',
 
-nepali={
+nepali='''
     "छ", "र", "पनि", "छन्", "लागि", "भएको", "गरेको", "भने", "गर्न",
     "गर्ने", "हो", "तथा", "यो", "रहेको", "उनले", "थियो", "हुने", "गरेका",
     "थिए", "गर्दै", "तर", "नै", "को", "मा", "हुन्", "भन्ने", "हुन", "गरी",
@@ -1255,9 +1286,9 @@ nepali={
     "बिरुद्ध", "बिशेष", "सायद", "शायद", "संग", "संगै", "सक्छ", "सट्टा",
     "सधै", "सबै", "सबैलाई", "समय", "सम्भव", "सम्म", "सही", "साँच्चै",
     "सात", "साथ", "साथै", "सारा", "सोही", "स्पष्ट", "हरे", "हरेक"
-},
+''',
 
-norwegian={
+norwegian='''
     "alle", "allerede", "alt", "and", "andre", "annen", "annet", "at", "av",
     "bak", "bare", "bedre", "beste", "blant", "ble", "bli", "blir", "blitt",
     "bris", "by", "både", "da", "dag", "de", "del", "dem", "den", "denne",
@@ -1288,9 +1319,9 @@ norwegian={
     "usa", "ut", "uten", "utenfor", "vant", "var", "ved", "veldig", "vi",
     "videre", "viktig", "vil", "ville", "viser", "vår", "være", "vært", "å",
     "år", "ønsker"
-},
+''',
 
-persian={
+persian='''
     "آخرین", "آقای", "آمد", "آمده", "آمده‌است", "آن", "آنان", "آنجا", "آنها",
     "آنچه", "آنکه", "آورد", "آوری", "آیا", "ابتدا", "اثر", "اجرا", "اخیر",
     "از", "است", "اش", "اغلب", "افراد", "افرادی", "افزود", "البته", "اما",
@@ -1336,9 +1367,9 @@ persian={
     "گرفت", "گرفته", "گرفته‌است", "گروهی", "گفت", "گفته", "گونه", "گیرد",
     "گیری", "یا", "یابد", "یافت", "یافته", "یافته‌است", "یعنی", "یک", "یکدیگر",
     "یکی"
-},
+''',
 
-polish={
+polish='''
     "a", "aby", "ach", "acz", "aczkolwiek", "aj", "albo", "ale", "alez",
     "ależ", "ani", "az", "aż", "bardziej", "bardzo", "beda", "bede", "bedzie",
     "bez", "bo", "bowiem", "by", "byc", "byl", "byla", "byli", "bylo", "byly",
@@ -1384,9 +1415,9 @@ polish={
     "xv", "z", "za", "zaden", "zadna", "zadne", "zadnych", "zapewne", "zawsze",
     "zaś", "ze", "zeby", "znow", "znowu", "znów", "zostal", "został", "żaden",
     "żadna", "żadne", "żadnych", "że", "żeby"
-},
+''',
 
-portuguese={
+portuguese='''
     "acerca", "ademais", "adeus", "agora", "ainda", "algo", "algumas",
     "alguns", "ali", "além", "ambas", "ambos", "antes", "ao", "aos", "apenas",
     "apoia", "apoio", "apontar", "após", "aquela", "aquelas", "aquele",
@@ -1438,9 +1469,9 @@ portuguese={
     "veja", "vem", "vens", "ver", "vez", "vezes", "vinda", "vindo", "vinte",
     "você", "vocês", "vos", "vossa", "vossas", "vosso", "vossos", "vários",
     "vão", "vêm", "vós", "zero", "à", "às", "área", "é", "és", "último"
-},
+''',
 
-romanian={
+romanian='''
     "a", "abia", "acea", "aceasta", "această", "aceea", "aceeasi", "acei",
     "aceia", "acel", "acela", "acelasi", "acele", "acelea", "acest", "acesta",
     "aceste", "acestea", "acestei", "acestia", "acestui", "aceşti", "aceştia",
@@ -1495,9 +1526,9 @@ romanian={
     "între", "întrucât", "întrucît", "îţi", "îți", "ăla", "ălea", "ăsta",
     "ăstea", "ăştia", "ăștia", "şapte", "şase", "şi", "ştiu", "ţi", "ţie",
     "șapte", "șase", "și", "știu", "ți", "ție"
-},
+''',
 
-russian={
+russian='''
     "а", "будем", "будет", "будете", "будешь", "буду", "будут", "будучи",
     "будь", "будьте", "бы", "был", "была", "были", "было", "быть", "в", "вам",
     "вами", "вас", "весь", "во", "вот", "все", "всего", "всей", "всем",
@@ -1528,17 +1559,17 @@ russian={
     "чего", "чем", "чему", "что", "чтобы", "чём", "эта", "эти", "этим",
     "этими", "этих", "это", "этого", "этой", "этом", "этому", "этот", "этою",
     "эту", "я"
-},
+''',
 
-sinhala={
+sinhala='''
     "අතර", "එච්චර", "එපමණ", "එලෙස", "එවිට", "ඒ", "කට", "කදී", "ක්", "කින්",
     "ට", "ත්", "තුර", "ද", "නමුත්", "නොහොත්", "පමණ", "පමණි", "ම", "මෙච්චර",
     "මෙපමණ", "මෙලෙස", "මෙවිට", "මේ", "ය", "යි", "ලදී", "ලෙස", "වගේ", "වන",
     "විට", "විටෙක", "විතර", "විය", "වුව", "වුවත්", "වුවද", "වූ", "සමඟ", "සහ",
     "හා", "හෙවත්", "හෝ"
-},
+''',
 
-spanish={
+spanish='''
     "actualmente", "acuerdo", "adelante", "ademas", "además", "adrede",
     "afirmó", "agregó", "ahi", "ahora", "ahí", "al", "algo", "alguna",
     "algunas", "alguno", "algunos", "algún", "alli", "allí", "alrededor",
@@ -1612,9 +1643,9 @@ spanish={
     "vuestras", "vuestro", "vuestros", "ya", "yo", "él", "ésa", "ésas", "ése",
     "ésos", "ésta", "éstas", "éste", "éstos", "última", "últimas", "último",
     "últimos"
-},
+''',
 
-swedish={
+swedish='''
     "aderton", "adertonde", "adjö", "aldrig", "alla", "allas", "allt",
     "alltid", "alltså", "andra", "andras", "annan", "annat", "arton",
     "artonde", "att", "av", "bakom", "bara", "behöva", "behövas", "behövde",
@@ -1665,9 +1696,9 @@ swedish={
     "vänstra", "värre", "vår", "våra", "vårt", "än", "ännu", "även",
     "åtminstone", "åtta", "åttio", "åttionde", "åttonde", "över", "övermorgon",
     "överst", "övre"
-},
+''',
 
-tagalog={
+tagalog='''
     "akin", "aking", "ako", "alin", "am", "amin", "aming", "ang", "ano",
     "anumang", "apat", "at", "atin", "ating", "ay", "bababa", "bago", "bakit",
     "bawat", "bilang", "dahil", "dalawa", "dapat", "din", "dito", "doon",
@@ -1688,9 +1719,9 @@ tagalog={
     "pataas", "pero", "pumunta", "pumupunta", "sa", "saan", "sabi", "sabihin",
     "sarili", "sila", "sino", "siya", "tatlo", "tayo", "tulad", "tungkol",
     "una", "walang"
-},
+''',
 
-tamil={
+tamil='''
     "அங்கு", "அங்கே", "அடுத்த", "அதனால்", "அதன்", "அதற்கு", "அதிக", "அதில்",
     "அது", "அதே", "அதை", "அந்த", "அந்தக்", "அந்தப்", "அன்று", "அல்லது", "அவன்",
     "அவரது", "அவர்", "அவர்கள்", "அவள்", "அவை", "ஆகிய", "ஆகியோர்", "ஆகும்",
@@ -1707,9 +1738,9 @@ tamil={
     "மட்டும்", "மற்ற", "மற்றும்", "மிக", "மிகவும்", "மீது", "முதல்", "முறை",
     "மேலும்", "மேல்", "யார்", "வந்த", "வந்து", "வரும்", "வரை", "வரையில்",
     "விட", "விட்டு", "வேண்டும்", "வேறு"
-},
+''',
 
-tatar={
+tatar='''
     "алай", "алайса", "алар", "аларга", "аларда", "алардан", "аларны",
     "аларның", "аларча", "алары", "аларын", "аларынга", "аларында",
     "аларыннан", "аларының", "алтмыш", "алтмышынчы", "алтмышынчыга",
@@ -1894,9 +1925,9 @@ tatar={
     "әнә", "өстәп", "өч", "өчен", "өченче", "өченчегә", "өченчедә",
     "өченчедән", "өченчеләр", "өченчеләргә", "өченчеләрдә", "өченчеләрдән",
     "өченчеләрне", "өченчеләрнең", "өченчене", "өченченең", "өчләп", "өчәрләп"
-},
+''',
 
-telugu={
+telugu='''
     "అందరూ", "అందుబాటులో", "అడగండి", "అడగడం", "అడ్డంగా", "అనుగుణంగా",
     "అనుమతించు", "అనుమతిస్తుంది", "అయితే", "ఇప్పటికే", "ఉన్నారు", "ఎక్కడైనా",
     "ఎప్పుడు", "ఎవరైనా", "ఎవరో", "ఏ", "ఏదైనా", "ఏమైనప్పటికి", "ఒక", "ఒకరు",
@@ -1904,9 +1935,9 @@ telugu={
     "తగిన", "తర్వాత", "దాదాపు", "దూరంగా", "నిజంగా", "పై", "ప్రకారం", "ప్రక్కన",
     "మధ్య", "మరియు", "మరొక", "మళ్ళీ", "మాత్రమే", "మెచ్చుకో", "వద్ద", "వెంట",
     "వేరుగా", "వ్యతిరేకంగా", "సంబంధం"
-},
+''',
 
-thai={
+thai='''
     "กระทั่ง", "กระทำ", "กระนั้น", "กระผม", "กลับ", "กลุ่ม", "กลุ่มก้อน",
     "กลุ่มๆ", "กล่าว", "กล่าวคือ", "กว่า", "กว้าง", "กว้างขวาง", "กว้างๆ",
     "กัน", "กันดีกว่า", "กันดีไหม", "กันนะ", "กันเถอะ", "กันเอง", "กันและกัน",
@@ -2054,9 +2085,9 @@ thai={
     "ไกลๆ", "ไง", "ไฉน", "ได้", "ได้ที่", "ได้มา", "ได้รับ", "ได้แก่",
     "ได้แต่", "ไป", "ไป่", "ไม่", "ไม่ค่อย", "ไม่ค่อยจะ", "ไม่ค่อยเป็น",
     "ไม่ว่า", "ไม่เป็นไร", "ไม่ใช่", "ไร", "ไว้", "ไหน", "ไหนๆ", "ๆ"
-},
+''',
 
-turkish={
+turkish='''
     "acaba", "acep", "adamakıllı", "adeta", "ait", "ama", "amma", "anca",
     "ancak", "arada", "artık", "aslında", "aynen", "ayrıca", "az", "açıkça",
     "açıkçası", "bana", "bari", "bazen", "bazı", "bazısı", "bazısına",
@@ -2138,9 +2169,9 @@ turkish={
     "şimdi", "şu", "şuna", "şuncacık", "şunda", "şundan", "şunlar", "şunları",
     "şunların", "şunu", "şunun", "şura", "şuracık", "şuracıkta", "şurası",
     "şöyle"
-},
+''',
 
-ukrainian={
+ukrainian='''
     "а", "або", "адже", "але", "алло", "багато", "без", "безперервно", "би",
     "близько", "був", "буває", "буде", "будемо", "будете", "будеш", "буду",
     "будуть", "будь", "була", "були", "було", "бути", "бывь", "більш",
@@ -2190,9 +2221,9 @@ ukrainian={
     "шостий", "шістнадцятий", "шістнадцять", "шість", "ще", "що", "щоб", "я",
     "як", "яка", "який", "яких", "якого", "якщо", "які", "якій", "ім'я",
     "іноді", "інша", "інше", "інший", "інших", "інші", "їй", "їх", "її"
-},
+''',
 
-urdu={
+urdu='''
     "آئی", "آئے", "آج", "آخر", "آدهی", "آش", "آًب", "آٹھ", "آیب", "اخبزت",
     "اختتبم", "ادھر", "ارد", "اردگرد", "ارکبى", "اش", "اضتعوبل", "اضتعوبلات",
     "اضطرذ", "اضکب", "اضکی", "اضکے", "اطراف", "اغیب", "افراد", "الگ", "اور",
@@ -2246,9 +2277,9 @@ urdu={
     "ہوبرا", "ہوبری", "ہوبرے", "ہوتی", "ہوتے", "ہورہب", "ہورہی", "ہورہے",
     "ہوضکتب", "ہوضکتی", "ہوضکتے", "ہوًب", "ہوًی", "ہوًے", "ہوچکب", "ہوچکی",
     "ہوچکے", "ہوگئی", "ہوگیب", "ہوں", "ہی", "ہیں", "ہے", "یقیٌی", "یہ", "یہبں"
-},
+''',
 
-vietnamese={
+vietnamese='''
     "", "a_ha", "a_lô", "ai", "ai_ai", "ai_nấy", "ai_đó", "alô", "amen", "anh",
     "anh_ấy", "ba", "ba_bau", "ba_bản", "ba_cùng", "ba_họ", "ba_ngày",
     "ba_ngôi", "ba_tăng", "bao_giờ", "bao_lâu", "bao_nhiêu", "bao_nả",
@@ -2548,6 +2579,8 @@ vietnamese={
     "ối_giời", "ối_giời_ơi", "ồ", "ồ_ồ", "ổng", "ớ", "ớ_này", "ờ", "ờ_ờ", "ở",
     "ở_lại", "ở_như", "ở_nhờ", "ở_năm", "ở_trên", "ở_vào", "ở_đây", "ở_đó",
     "ở_được", "ủa", "ứ_hự", "ứ_ừ", "ừ", "ừ_nhé", "ừ_thì", "ừ_ào", "ừ_ừ", "ử"
-},
+''',
 
 )
+
+stopwords = _LazyStopwords(_STOPWORDS_RAW)
@@ -1,33 +1,268 @@
+import logging
+import math
+import os
 import re
+import shutil
+import tempfile
 from collections import defaultdict
+from heapq import heappop, heappush, heapreplace, merge
+from itertools import groupby, islice, repeat
+from numbers import Integral
+from operator import itemgetter
 
-import advertools as adv
+import numpy as np
 import pandas as pd
 
-from advertools.word_tokenize import word_tokenize
+from advertools.stopwords import stopwords
+from advertools.word_tokenize import TokenizedCorpus, _tokenize
+
+
+def _rm_words_set(rm_words):
+    """Return ``rm_words`` as a set (once per call, for fast membership
+    tests), with ``None`` meaning the English stopwords."""
+    if rm_words is None:
+        return stopwords['english']
+    if isinstance(rm_words, (set, frozenset)):
+        return rm_words
+    return set(rm_words)
+
+
+class _SpaceSaving:
+    """Space-Saving summary keeping the (at most) ``capacity`` heaviest
+    items of a stream of (non-negative) weights. Each count overestimates
+    the true sum of weights by at most ``total / capacity``.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.counts = {}
+        self._heap = []
+
+    def add(self, item, weight=1):
+        counts = self.counts
+        if item in counts:
+            # heap entries are refreshed lazily on eviction
+            counts[item] += weight
+            return
+        if len(counts) < self.capacity:
+            counts[item] = weight
+            heappush(self._heap, (weight, item))
+            return
+        heap = self._heap
+        while heap[0][0] != counts[heap[0][1]]:
+            heapreplace(heap, (counts[heap[0][1]], heap[0][1]))
+        min_count, victim = heappop(heap)
+        del counts[victim]
+        counts[item] = min_count + weight
+        heappush(heap, (min_count + weight, item))
+
+
+class _CountMinSketch:
+    """Count-min sketch of absolute and weighted frequencies. Estimates are
+    never lower than the true (non-negative) sums, and exceed them by at
+    most ``error`` times the total with probability ``confidence``.
+    """
+    _prime = 2 ** 31 - 1
+
+    def __init__(self, error, confidence, seed=0):
+        self.width = math.ceil(math.e / error)
+        self.depth = math.ceil(math.log(1 / (1 - confidence)))
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, self._prime, self.depth).astype('int64')
+        self._b = rng.randint(0, self._prime, self.depth).astype('int64')
+        self.abs_table = np.zeros((self.depth, self.width))
+        self.table = np.zeros((self.depth, self.width))
+
+    def _indexes(self, items):
+        hashes = np.array([hash(x) % self._prime for x in items],
+                          dtype='int64')
+        return ((np.outer(self._a, hashes) + self._b[:, None])
+                % self._prime % self.width)
+
+    def update(self, items, weights):
+        indexes = self._indexes(items)
+        for row in range(self.depth):
+            np.add.at(self.abs_table[row], indexes[row], 1)
+            np.add.at(self.table[row], indexes[row], weights)
+
+    def query(self, items):
+        """Return the estimated absolute and weighted frequencies of
+        ``items``."""
+        indexes = self._indexes(items)
+        rows = np.arange(self.depth)[:, None]
+        return (self.abs_table[rows, indexes].min(axis=0),
+                self.table[rows, indexes].min(axis=0))
+
+
+def _approximate_word_freq(tokenized, num_list, rm_words, top_n, error,
+                           confidence, batch_size=100000):
+    """Return ``{word: [abs_freq, wtd_freq]}`` for the ``top_n`` phrases
+    using bounded memory, together with the exact totals of the stream.
+    Candidates are the heaviest phrases by weight, as in the output, and
+    both frequencies are estimated from the same sketch buckets. Weighted
+    frequencies are integers, as in exact counting, if all of ``num_list``
+    are."""
+    space_saving = _SpaceSaving(max(top_n, math.ceil(1 / error)))
+    sketch = _CountMinSketch(error, confidence)
+    total_abs = total_wtd = 0
+    integral = True
+    words, weights = [], []
+    for text, num in zip(tokenized, num_list):
+        integral = integral and isinstance(num, Integral)
+        for word in text:
+            if word in rm_words:
+                continue
+            space_saving.add(word, num)
+            words.append(word)
+            weights.append(num)
+        if len(words) >= batch_size:
+            sketch.update(words, weights)
+            total_abs += len(words)
+            total_wtd += sum(weights)
+            words, weights = [], []
+    if words:
+        sketch.update(words, weights)
+        total_abs += len(words)
+        total_wtd += sum(weights)
+    candidates = list(space_saving.counts)
+    if not candidates:
+        return {}, total_abs, total_wtd
+    abs_freqs, wtd_freqs = sketch.query(candidates)
+    if integral:
+        wtd_freqs = wtd_freqs.astype('int64')
+    top = np.argsort(-wtd_freqs, kind='mergesort')[:top_n]
+    word_freq = {candidates[i]: [int(abs_freqs[i]), wtd_freqs[i]]
+                 for i in top}
+    return word_freq, total_abs, total_wtd
+
+
+def _corpus_word_freq(corpus, num_list, phrase_len, rm_words):
+    """Return ``{word: [abs_freq, wtd_freq]}`` counted on the integer ids
+    of a :class:`TokenizedCorpus`, in order of first occurrence."""
+    ngrams, doc_index = corpus.ngrams(phrase_len)
+    if not isinstance(num_list, (np.ndarray, pd.Series, list, tuple)):
+        num_list = list(islice(num_list, len(corpus)))
+    nums = np.asarray(num_list)
+    if len(nums) < len(corpus):
+        # as with zip() on texts, documents without a number aren't counted
+        keep = doc_index < len(nums)
+        ngrams, doc_index = ngrams[keep], doc_index[keep]
+    vocab_size = max(len(corpus.vocabulary), 1)
+    if vocab_size ** phrase_len < 2 ** 63:
+        # one int64 key per phrase, much faster to sort than rows
+        keys = np.zeros(len(ngrams), dtype='int64')
+        for i in range(phrase_len):
+            keys = keys * vocab_size + ngrams[:, i]
+        _, first, inverse = np.unique(keys, return_index=True,
+                                      return_inverse=True)
+        unique = ngrams[first]
+    else:
+        unique, first, inverse = np.unique(ngrams, axis=0, return_index=True,
+                                           return_inverse=True)
+    inverse = inverse.ravel()
+    abs_freq = np.bincount(inverse, minlength=len(unique))
+    wtd_freq = np.bincount(inverse, weights=nums[doc_index],
+                           minlength=len(unique))
+    if nums.dtype.kind in 'iub':
+        wtd_freq = wtd_freq.astype('int64')
+
+    word_ids = {word: i for i, word in enumerate(corpus.vocabulary)}
+    rm_phrases = set()
+    for word in rm_words:
+        phrase = [word_ids.get(w) for w in word.split(' ')]
+        if len(phrase) == phrase_len and None not in phrase:
+            rm_phrases.add(tuple(phrase))
+    order = np.argsort(first, kind='mergesort')
+    if rm_phrases:
+        keep = np.array([tuple(row) not in rm_phrases
+                         for row in unique[order].tolist()], dtype=bool)
+        order = order[keep]
+    unique = unique[order]
+    words = corpus.vocabulary[unique[:, 0]]
+    for i in range(1, phrase_len):
+        words = words + ' ' + corpus.vocabulary[unique[:, i]]
+    return dict(zip(words.tolist(), zip(abs_freq[order].tolist(),
+                                        wtd_freq[order].tolist())))
+
+
+def _abs_wtd_df(word_freq, extra_info=False, total_abs=None, total_wtd=None):
+    """Build the output DataFrame of :func:`word_frequency` out of a
+    ``{word: [abs_freq, wtd_freq]}`` dictionary."""
+    columns = ['abs_freq', 'wtd_freq']
+
+    abs_wtd_df = (pd.DataFrame.from_dict(word_freq, orient='index',
+                                         columns=columns)
+                  .sort_values('wtd_freq', ascending=False)
+                  .assign(rel_value=lambda df: df['wtd_freq'] / df['abs_freq'])
+                  .round())
+    if extra_info:
+        if total_abs is None:
+            total_abs = abs_wtd_df['abs_freq'].sum()
+        if total_wtd is None:
+            total_wtd = abs_wtd_df['wtd_freq'].sum()
+        abs_wtd_df.insert(1, 'abs_perc', value=abs_wtd_df['abs_freq'] /
+                          total_abs)
+        abs_wtd_df.insert(2, 'abs_perc_cum', abs_wtd_df['abs_perc'].cumsum())
+        abs_wtd_df.insert(4, 'wtd_freq_perc', abs_wtd_df['wtd_freq'] /
+                          total_wtd)
+        abs_wtd_df.insert(5, 'wtd_freq_perc_cum',
+                          abs_wtd_df['wtd_freq_perc'].cumsum())
+
+    abs_wtd_df = abs_wtd_df.reset_index().rename(columns={'index': 'word'})
+
+    return abs_wtd_df
 
 
 def word_frequency(text_list, num_list=None, phrase_len=1, regex=None,
-                   rm_words=adv.stopwords['english'], extra_info=False):
+                   rm_words=None, extra_info=False,
+                   approximate=False, top_n=100, error=0.0001,
+                   confidence=0.99, regex_tokens=False):
     """Count the absolute as well as the weighted frequency of words
     in ``text_list`` (based on ``num_list``).
 
     :param text_list: iterable of strings.
         Typically short phrases, but could be any list of full blown documents.
         Usually, you would use this to analyze tweets, book titles, URLs, etc.
+        A :class:`TokenizedCorpus` can be supplied instead, to count
+        directly on its integer word ids without tokenizing again.
     :param num_list: iterable of numbers.
         A list of numbers with the same length as ``text_list``, describing a
         certain attribute of these 'documents'; views, retweets, sales, etc.
     :param regex: string.
         The regex used to split words. Doesn't need changing in most cases.
+        Its matches are tokenized and counted instead of the full text, so
+        matches with several words are counted as separate words.
+        Not available for a :class:`TokenizedCorpus`, supply it when
+        creating the corpus instead.
+    :param regex_tokens: boolean.
+        Whether or not to count each match of ``regex`` (lower-cased) as a
+        word as it is, instead of tokenizing the matches again. Faster, and
+        gives the same result for patterns that match single words without
+        delimiters around them, like ``'[a-zA-Z]+'``. Defaults to False.
     :param phrase_len: integer, the length in words of each token the
         text is split into, defaults to 1.
     :param rm_words: iterable of strings.
-        Words to remove from the list 'stop-words'. The default uses
+        Words to remove from the list 'stop-words'. The default (None) uses
         ``spacy``'s list of English stopwords. To get all available languages
         run ``adv.stopwords.keys()``
     :param extra_info: boolean.
         Whether or not to give additional columns about the frequencies
+    :param approximate: boolean.
+        Whether or not to count in bounded memory, for corpora with too many
+        distinct phrases to fit in a dictionary. Candidate phrases are
+        the heaviest ones by ``num_list``, tracked with the Space-Saving
+        algorithm, and their absolute and weighted frequencies are
+        estimated with a count-min sketch. Both are upper bounds of the
+        exact values. Only the ``top_n`` phrases are returned. Assumes
+        ``num_list`` values are not negative.
+    :param top_n: integer, the number of phrases to return when
+        ``approximate`` is True, defaults to 100.
+    :param error: float, the maximum overestimation of each frequency, as a
+        fraction of the total (absolute or weighted) frequency of all
+        phrases, when ``approximate`` is True. Memory used grows with
+        ``1 / error``.
+    :param confidence: float, the probability that the frequency
+        estimates are within ``error`` when ``approximate`` is True.
     :returns abs_wtd_df: absolute and weighted DataFrame.
         pandas.DataFrame with several metrics calculated. The most important
         are ``abs_freq`` and ``wtd_freq``. These show the difference between
@@ -114,39 +349,243 @@ def word_frequency(text_list, num_list=None, phrase_len=1, regex=None,
 
     This is the same result as above but giving the full DataFrame including
     all columns.
+
+    For very large corpora, ``approximate=True`` keeps memory bounded
+    and returns the ``top_n`` phrases, with percentages in ``extra_info``
+    relative to the exact totals of all phrases:
+
+    >>> adv.word_frequency(text_list, num_list, approximate=True, top_n=2)
+        word  abs_freq  wtd_freq  rel_value
+    0   kiwi         2       500      250.0
+    1  mango         1       400      400.0
     """
     if num_list is None:
         num_list = [1 for i in range(len(text_list))]
-    if isinstance(regex, str):
-        regex = re.compile(regex)
-        text_list = [' '.join(regex.findall(text)) for text in text_list]
+    rm_words = _rm_words_set(rm_words)
+    if isinstance(text_list, TokenizedCorpus):
+        if regex is not None:
+            raise ValueError('regex cannot be applied to a TokenizedCorpus,'
+                             ' please supply it when creating the corpus')
+        if not approximate:
+            word_freq = _corpus_word_freq(text_list, num_list, phrase_len,
+                                          rm_words)
+            return _abs_wtd_df(word_freq, extra_info)
+        tokenized = text_list.phrases(phrase_len)
+    else:
+        if isinstance(regex, str):
+            regex = re.compile(regex)
+        tokenized = (_tokenize(text, phrase_len, regex, regex_tokens)
+                     for text in text_list)
+
+    if approximate:
+        if not 0 < error < 1:
+            raise ValueError('error should be between 0 and 1, '
+                             'got {}'.format(error))
+        if not 0 < confidence < 1:
+            raise ValueError('confidence should be between 0 and 1, '
+                             'got {}'.format(confidence))
+        word_freq, total_abs, total_wtd = _approximate_word_freq(
+            tokenized, num_list, rm_words, top_n, error, confidence)
+        return _abs_wtd_df(word_freq, extra_info, total_abs, total_wtd)
 
     word_freq = defaultdict(lambda: [0, 0])
 
-    for text, num in zip(word_tokenize(text_list, phrase_len=phrase_len),
-                         num_list):
+    for text, num in zip(tokenized, num_list):
         for word in text:
-            if word.lower() in rm_words:
+            if word in rm_words:
                 continue
-            word_freq[word.lower()][0] += 1
-            word_freq[word.lower()][1] += num
+            freq = word_freq[word]
+            freq[0] += 1
+            freq[1] += num
 
-    columns = ['abs_freq', 'wtd_freq']
+    return _abs_wtd_df(word_freq, extra_info)
 
-    abs_wtd_df = (pd.DataFrame.from_dict(word_freq, orient='index',
-                                         columns=columns)
-                  .sort_values('wtd_freq', ascending=False)
-                  .assign(rel_value=lambda df: df['wtd_freq'] / df['abs_freq'])
-                  .round())
-    if extra_info:
-        abs_wtd_df.insert(1, 'abs_perc', value=abs_wtd_df['abs_freq'] /
-                          abs_wtd_df['abs_freq'].sum())
-        abs_wtd_df.insert(2, 'abs_perc_cum', abs_wtd_df['abs_perc'].cumsum())
-        abs_wtd_df.insert(4, 'wtd_freq_perc', abs_wtd_df['wtd_freq'] /
-                          abs_wtd_df['wtd_freq'].sum())
-        abs_wtd_df.insert(5, 'wtd_freq_perc_cum',
-                          abs_wtd_df['wtd_freq_perc'].cumsum())
 
-    abs_wtd_df = abs_wtd_df.reset_index().rename(columns={'index': 'word'})
+def _write_run(items, run_dir):
+    """Write ``(word, abs_freq, wtd_freq)`` items, sorted by word, to a new
+    run file in ``run_dir`` and return its path."""
+    fd, path = tempfile.mkstemp(suffix='.tsv', dir=run_dir)
+    with open(fd, 'wt', encoding='utf-8') as run:
+        for word, abs_freq, wtd_freq in items:
+            run.write('{}\t{}\t{}\n'.format(word, abs_freq, wtd_freq))
+    return path
 
-    return abs_wtd_df
+
+def _read_run(path):
+    with open(path, 'rt', encoding='utf-8') as run:
+        for line in run:
+            word, abs_freq, wtd_freq = line[:-1].split('\t')
+            try:
+                wtd_freq = int(wtd_freq)
+            except ValueError:
+                wtd_freq = float(wtd_freq)
+            yield word, int(abs_freq), wtd_freq
+
+
+def _merge_runs(paths):
+    """Merge sorted run files, summing the frequencies of equal words."""
+    for word, group in groupby(merge(*[_read_run(p) for p in paths]),
+                               key=itemgetter(0)):
+        abs_freq = wtd_freq = 0
+        for _, abs_, wtd in group:
+            abs_freq += abs_
+            wtd_freq += wtd
+        yield word, abs_freq, wtd_freq
+
+
+def _write_parquet(items, path, batch_size=100000):
+    """Stream ``(word, abs_freq, wtd_freq)`` items to a Parquet file in
+    batches, and return the number of rows written."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError('writing to output_file requires pyarrow, please '
+                          'install it with `pip install pyarrow`')
+    writer = None
+    rows = 0
+    try:
+        while True:
+            batch = list(islice(items, batch_size))
+            if not batch and writer is not None:
+                break
+            df = pd.DataFrame(batch, columns=['word', 'abs_freq', 'wtd_freq'])
+            df = df.astype({'word': object, 'abs_freq': 'int64',
+                            'wtd_freq': 'float64'})
+            df['rel_value'] = df['wtd_freq'] / df['abs_freq']
+            df[['wtd_freq', 'rel_value']] = df[['wtd_freq',
+                                                'rel_value']].round()
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+            rows += len(batch)
+            if len(batch) < batch_size:
+                break
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def word_frequency_external(text_list, num_list=None, phrase_len=1,
+                            regex=None, rm_words=None,
+                            extra_info=False, max_phrases=1000000,
+                            tmp_dir=None, output_file=None, max_runs=64,
+                            regex_tokens=False):
+    """Count the absolute and weighted frequency of words, like
+    :func:`word_frequency`, for corpora with more distinct phrases than
+    can fit in memory.
+
+    Counts are kept in memory for at most ``max_phrases`` distinct phrases.
+    Once that budget is reached, they are sorted and written ("spilled") to a
+    run file on disk, and counting starts again. All runs are then merged
+    into the exact final counts. ``text_list`` and ``num_list`` may be
+    generators (e.g. lines of a file), so the texts themselves don't have
+    to be in memory either.
+
+    The spill statistics are logged, and returned when ``output_file`` is
+    given.
+
+    :param text_list: iterable of strings.
+    :param num_list: iterable of numbers, optional, see
+        :func:`word_frequency`.
+    :param phrase_len: integer, the length in words of each phrase.
+    :param regex: string, the regex used to split words, see
+        :func:`word_frequency`.
+    :param rm_words: iterable of strings, words to remove, defaults to
+        English stopwords.
+    :param extra_info: boolean, whether or not to give additional columns
+        about the frequencies. Not available with ``output_file``.
+    :param max_phrases: integer, the memory budget, the maximum number of
+        distinct phrases counted in memory before spilling to disk.
+    :param tmp_dir: string, the directory in which to write the run files.
+        Defaults to the system's temporary directory. The files are deleted
+        when done.
+    :param output_file: string, optional. A Parquet file to stream the
+        result to (requires ``pyarrow``), instead of returning a DataFrame.
+        Rows are ordered by ``word`` instead of ``wtd_freq``, as sorting by
+        frequency would need all of them in memory.
+    :param max_runs: integer, the maximum number of run files merged at
+        once, at least 2. More runs than that are first merged into larger
+        runs.
+    :param regex_tokens: boolean, whether or not to count the matches of
+        ``regex`` as they are, see :func:`word_frequency`.
+    :returns abs_wtd_df or spill_stats: the same DataFrame as
+        :func:`word_frequency` (up to the order of rows with equal
+        ``wtd_freq``), or a dictionary of spill statistics if
+        ``output_file`` is given.
+
+    >>> with open('search_queries.txt') as queries:
+    ...     word_frequency_external(queries, phrase_len=3,
+    ...                             max_phrases=5000000,
+    ...                             output_file='phrases.parquet')
+    {'phrases_counted': 84377461, 'spills': 9, 'spilled_phrases': 45000000,
+     'spilled_bytes': 1305417880, 'merge_passes': 1,
+     'distinct_phrases': 31005723}
+    """
+    if output_file is not None and extra_info:
+        raise ValueError('extra_info is not available with output_file')
+    if max_phrases < 1:
+        raise ValueError('max_phrases should be at least 1, '
+                         'got {}'.format(max_phrases))
+    if max_runs < 2:
+        raise ValueError('max_runs should be at least 2, '
+                         'got {}'.format(max_runs))
+    rm_words = _rm_words_set(rm_words)
+    if num_list is None:
+        num_list = repeat(1)
+    if isinstance(regex, str):
+        regex = re.compile(regex)
+
+    run_dir = tempfile.mkdtemp(prefix='advertools_', dir=tmp_dir)
+    stats = dict(phrases_counted=0, spills=0, spilled_phrases=0,
+                 spilled_bytes=0, merge_passes=0, distinct_phrases=0)
+    try:
+        runs = []
+        word_freq = defaultdict(lambda: [0, 0])
+        for text, num in zip(text_list, num_list):
+            for word in _tokenize(text, phrase_len, regex, regex_tokens):
+                if word in rm_words:
+                    continue
+                freq = word_freq[word]
+                freq[0] += 1
+                freq[1] += num
+                stats['phrases_counted'] += 1
+            if len(word_freq) >= max_phrases:
+                runs.append(_write_run(((word, *freq) for word, freq
+                                        in sorted(word_freq.items())),
+                                       run_dir))
+                stats['spills'] += 1
+                stats['spilled_phrases'] += len(word_freq)
+                stats['spilled_bytes'] += os.path.getsize(runs[-1])
+                word_freq.clear()
+
+        if runs and word_freq:
+            runs.append(_write_run(((word, *freq) for word, freq
+                                    in sorted(word_freq.items())), run_dir))
+            word_freq.clear()
+        while len(runs) > max_runs:
+            stats['merge_passes'] += 1
+            runs = [_write_run(_merge_runs(runs[i:i + max_runs]), run_dir)
+                    for i in range(0, len(runs), max_runs)]
+        if runs:
+            stats['merge_passes'] += 1
+            merged = _merge_runs(runs)
+        else:
+            merged = ((word, *freq)
+                      for word, freq in sorted(word_freq.items()))
+
+        if output_file is None:
+            word_freq = {word: [abs_freq, wtd_freq]
+                         for word, abs_freq, wtd_freq in merged}
+            stats['distinct_phrases'] = len(word_freq)
+            result = _abs_wtd_df(word_freq, extra_info)
+        else:
+            stats['distinct_phrases'] = _write_parquet(merged, output_file)
+            result = stats
+    finally:
+        shutil.rmtree(run_dir, ignore_errors=True)
+    logging.info(msg='word_frequency_external: ' +
+                 ', '.join(k + '=' + str(v) for k, v in stats.items()))
+    return result
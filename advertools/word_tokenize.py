@@ -1,5 +1,142 @@
+import re
+from array import array
+
+import numpy as np
+
 from .regex import WORD_DELIM
 
+# The characters of ``WORD_DELIM`` that ``str.strip`` would remove, as a
+# regex character class.
+_DELIM_CLASS = '[' + re.escape(''.join(sorted(set(WORD_DELIM)))) + ']'
+_NON_DELIM_CLASS = _DELIM_CLASS.replace('[', r'[^\s', 1)
+
+# One whitespace-separated word, with the delimiters on both sides of it
+# outside the captured group. Equivalent to ``word.strip(WORD_DELIM)`` for
+# each word of ``text.split()``, in a single scan of the text.
+_WORD_TOKEN = re.compile(r'(?<!\S)(?=\S)' + _DELIM_CLASS + '*'
+                         r'((?:' + _NON_DELIM_CLASS +
+                         r'(?:\S*' + _NON_DELIM_CLASS + ')?)?)' +
+                         _DELIM_CLASS + r'*(?!\S)')
+
+
+def _tokenize(text, phrase_len=1, regex=None, regex_tokens=False):
+    """Return the phrases of length ``phrase_len`` of a single ``text``.
+
+    If a compiled ``regex`` is given, its matches are tokenized instead of
+    the whole text. By default, the matches are joined with spaces and
+    tokenized like any text, which keeps the results of earlier versions,
+    where matches with several words (or with delimiters around them) are
+    split into lower-case, stripped words. With ``regex_tokens``, each
+    match is lower-cased and used as a word as it is, without tokenizing
+    it again.
+    """
+    if regex is not None and regex_tokens:
+        words = [match.lower() for match in regex.findall(text)]
+    else:
+        if regex is not None:
+            text = ' '.join(regex.findall(text))
+        words = _WORD_TOKEN.findall(text.lower())
+    if phrase_len == 1:
+        return words
+    return [' '.join(words[i:i + phrase_len])
+            for i in range(len(words) - phrase_len + 1)]
+
+
+class TokenizedCorpus:
+    """Tokenize ``text_list`` once, and keep it as integer word ids, to be
+    reused across several analyses.
+
+    Words are tokenized the same way as in :func:`word_tokenize`. Each
+    distinct word gets an id in ``vocabulary`` (in order of first
+    occurrence), and the words of document ``i`` are
+    ``ids[offsets[i]:offsets[i + 1]]``.
+
+    :func:`word_frequency`, :func:`word_tokenize` and
+    :func:`extract_words` accept a ``TokenizedCorpus`` in place of
+    ``text_list``, so that different ``num_list``, ``rm_words`` and
+    ``phrase_len`` values don't require tokenizing the text again.
+
+    :param text_list: iterable of strings.
+    :param regex: string, optional. If given, only its matches in each text
+        are tokenized, like the ``regex`` parameter of
+        :func:`word_frequency`.
+
+    :attribute vocabulary: numpy array of the distinct words.
+    :attribute ids: int32 numpy array of the word ids of all documents.
+    :attribute offsets: int64 numpy array, with the start of each document
+        in ``ids`` (and the total number of words as its last element).
+
+    >>> corpus = TokenizedCorpus(['apple orange', 'apple orange banana',
+    ...                           'apple kiwi', 'kiwi mango'])
+    >>> corpus.vocabulary
+    array(['apple', 'orange', 'banana', 'kiwi', 'mango'], dtype=object)
+    >>> corpus.ids
+    array([0, 1, 0, 1, 2, 0, 3, 3, 4], dtype=int32)
+    >>> corpus.offsets
+    array([0, 2, 5, 7, 9])
+
+    >>> adv.word_frequency(corpus, [100, 100, 100, 400])
+         word  abs_freq  wtd_freq  rel_value
+    0    kiwi         2       500      250.0
+    1   mango         1       400      400.0
+    2   apple         3       300      100.0
+    3  orange         2       200      100.0
+    4  banana         1       100      100.0
+    """
+
+    def __init__(self, text_list, regex=None):
+        if isinstance(text_list, str):
+            text_list = [text_list]
+        if isinstance(regex, str):
+            regex = re.compile(regex)
+        vocabulary = {}
+        ids = array('i')
+        offsets = array('q', [0])
+        for text in text_list:
+            ids.extend([vocabulary.setdefault(word, len(vocabulary))
+                        for word in _tokenize(text, regex=regex)])
+            offsets.append(len(ids))
+        self.vocabulary = np.empty(len(vocabulary), dtype=object)
+        self.vocabulary[:] = list(vocabulary)
+        self.ids = np.frombuffer(ids, dtype='int32')
+        self.offsets = np.frombuffer(offsets, dtype='int64')
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __repr__(self):
+        return ('TokenizedCorpus(documents={}, words={}, vocabulary={})'
+                .format(len(self), len(self.ids), len(self.vocabulary)))
+
+    def ngrams(self, phrase_len=1):
+        """Return the ids of all phrases of ``phrase_len`` words, as an
+        int32 array of shape (phrases, phrase_len), together with the
+        index of the document of each phrase. Phrases don't cross document
+        boundaries."""
+        doc_index = np.repeat(np.arange(len(self)), np.diff(self.offsets))
+        num_starts = len(self.ids) - phrase_len + 1
+        if num_starts <= 0:
+            return (np.empty((0, phrase_len), dtype='int32'),
+                    np.empty(0, dtype='int64'))
+        positions = np.arange(num_starts)
+        ends = self.offsets[1:][doc_index[:num_starts]]
+        positions = positions[positions + phrase_len <= ends]
+        ngrams = np.stack([self.ids[positions + i]
+                           for i in range(phrase_len)], axis=1)
+        return ngrams, doc_index[positions]
+
+    def phrases(self, phrase_len=1):
+        """Return the phrases of each document as lists of strings, the
+        same as ``word_tokenize`` on the original ``text_list``."""
+        words = self.vocabulary[self.ids].tolist()
+        offsets = self.offsets.tolist()
+        result = []
+        for start, end in zip(offsets[:-1], offsets[1:]):
+            doc = words[start:end]
+            result.append([' '.join(doc[i:i + phrase_len])
+                           for i in range(len(doc) - phrase_len + 1)])
+        return result
+
 
 def word_tokenize(text_list, phrase_len=2):
     """Split ``text_list`` into phrases of length ``phrase_len`` words each.
@@ -9,7 +146,7 @@ def word_tokenize(text_list, phrase_len=2):
     Delimiters include quotes, question marks, parentheses, etc.
     Any delimiter contained within the string remains. See examples below.
 
-    :param text_list: List of strings.
+    :param text_list: List of strings, or a :class:`TokenizedCorpus`.
     :param phrase_len: Length of word tokens, defaults to 2.
     :return tokenized: List of lists, split according to ``token_word_len``.
 
@@ -41,10 +178,9 @@ def word_tokenize(text_list, phrase_len=2):
     'remain $1,000 but', '$1,000 but not', 'but not the',
     'not the trailing', 'the trailing commas']]
     """
+    if isinstance(text_list, TokenizedCorpus):
+        return text_list.phrases(phrase_len)
     if isinstance(text_list, str):
         text_list = [text_list]
-    split = [text.lower().split() for text in text_list]
-    split = [[word.strip(WORD_DELIM) for word in text] for text in split]
 
-    return [[' '.join(s[i:i + phrase_len])
-             for i in range(len(s) - phrase_len + 1)] for s in split]
+    return [_tokenize(text, phrase_len) for text in text_list]
@@ -1,5 +1,6 @@
-from advertools.ad_create import ad_create
+from advertools.ad_create import ad_create, ad_create_batch
 
+import pandas as pd
 import pytest
 
 
@@ -34,3 +35,52 @@ def test_final_string_capitalized_or_not():
                            'Hello Four']
     assert not_capitalized == ['heLLo ONE', 'heLLo tWo', 'heLLo tHree',
                                'heLLo Four']
+
+
+def test_batch_same_as_ad_create():
+    replacements = ['one', 'two', 'three hundred thousand', 'Four']
+    ads_df = pd.DataFrame({
+        'template': ['heLLo {}'] * 4 + ['{0} and {0} again'] * 4,
+        'replacement': replacements * 2,
+        'fallback': ['fallback'] * 4 + ['fb'] * 4})
+    for capitalize in [True, False]:
+        expected = (ad_create('heLLo {}', replacements, 'fallback',
+                              max_len=20, capitalize=capitalize) +
+                    ad_create('{0} and {0} again', replacements, 'fb',
+                              max_len=20, capitalize=capitalize))
+        result = ad_create_batch(ads_df, max_len=20, capitalize=capitalize)
+        assert result.tolist() == expected
+
+
+def test_batch_raises_error_for_long_fallback():
+    ads_df = pd.DataFrame({'template': ['short {}', 'short {}'],
+                           'replacement': ['one', 'two'],
+                           'fallback': ['ok', 'very long fallback string']})
+    with pytest.raises(ValueError):
+        ad_create_batch(ads_df, max_len=20)
+
+
+def test_batch_capitalizes_like_capwords():
+    templates = ['{} is here', 'buy  {}', '{}s are  cheap ', 'x{}y',
+                 'Pre-{} sale', '{0} {0}', '{0}{0}', 'no slot', ' {} ']
+    replacements = ['one', 'tWO words', ' padded ', '', 'a-b', '  ']
+    ads_df = pd.DataFrame({
+        'template': [t for t in templates for r in replacements],
+        'replacement': replacements * len(templates),
+        'fallback': 'fb'})
+    expected = [ad_create(t, [r], 'fb', max_len=40)[0]
+                for t in templates for r in replacements]
+    assert ad_create_batch(ads_df, max_len=40).tolist() == expected
+
+
+def test_batch_format_specs_same_as_ad_create():
+    templates = ['{:.3} x', '{!r} q', '{:>8}', 'buy {} now']
+    replacements = ['abcdef', 'abc', 'x' * 21, 'ab']
+    ads_df = pd.DataFrame({
+        'template': [t for t in templates for r in replacements],
+        'replacement': replacements * len(templates),
+        'fallback': 'fb'})
+    for capitalize in [True, False]:
+        expected = [ad_create(t, [r], 'fb', 12, capitalize)[0]
+                    for t in templates for r in replacements]
+        assert ad_create_batch(ads_df, 12, capitalize).tolist() == expected
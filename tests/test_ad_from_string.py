@@ -1,4 +1,4 @@
-from advertools.ad_from_string import ad_from_string
+from advertools.ad_from_string import ad_from_string, ads_from_strings
 
 
 def test_len_result_one_more_than_len_slots():
@@ -35,3 +35,21 @@ def test_result_lengths_within_slots():
         result = ad_from_string(s, slots=slots)
         for string, slot in zip(result, slots):
             assert len(string) <= slot
+
+
+def test_empty_words_with_sep_absorbed_at_slot_start():
+    result = ad_from_string(',,one,,two,three', slots=(6, 10), sep=',')
+    assert result == ['one ', 'two three', '']
+
+
+def test_ads_from_strings_same_as_ad_from_string():
+    texts = ['This text will be split by the Function',
+             'this is a longer ad and will take the first two slots', '']
+    slots = (10, 15, 10)
+    for n_jobs in [None, 2]:
+        result = ads_from_strings(texts, slots, capitalize=True,
+                                  n_jobs=n_jobs)
+        assert list(result.columns) == ['slot_1', 'slot_2', 'slot_3',
+                                        'remainder']
+        assert result.values.tolist() == [
+            ad_from_string(text, slots, capitalize=True) for text in texts]
@@ -0,0 +1,42 @@
+import pytest
+
+from advertools.doc_term_matrix import doc_term_matrix
+from advertools.word_frequency import word_frequency
+
+pytest.importorskip('scipy')
+
+text_list = [
+    'one two',
+    'one two  three',
+    'one-two-three',
+    'four five',
+    'four five',
+    'four six'
+]
+
+num_list = [100, 200, 300, 400, 500, 600]
+
+
+def test_shape_is_docs_by_vocabulary():
+    matrix, vocab = doc_term_matrix(text_list, rm_words=[])
+    assert matrix.shape == (len(text_list), len(vocab))
+    assert matrix.indices.dtype == 'int32'
+
+
+def test_column_sums_match_word_frequency():
+    for nums in [None, num_list]:
+        for phrase_len in [1, 2]:
+            matrix, vocab = doc_term_matrix(text_list, nums, phrase_len,
+                                            rm_words=[])
+            freq = word_frequency(text_list, nums, phrase_len, rm_words=[])
+            col = 'abs_freq' if nums is None else 'wtd_freq'
+            expected = freq.set_index('word')[col]
+            sums = dict(zip(vocab, matrix.sum(axis=0).A1))
+            assert sums == expected.to_dict()
+
+
+def test_rm_words_excluded():
+    matrix, vocab = doc_term_matrix(text_list, rm_words=['one', 'two'])
+    assert 'one' not in vocab
+    assert 'two' not in vocab
+    assert matrix.shape[1] == len(vocab)
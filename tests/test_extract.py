@@ -4,6 +4,7 @@ from advertools.extract import (extract, extract_currency, extract_emoji,
                                 extract_exclamations, extract_hashtags,
                                 extract_intense_words, extract_mentions,
                                 extract_questions, extract_words, extract_urls)
+from advertools.word_tokenize import TokenizedCorpus
 
 mention_posts = ['hello @name', 'email@domain.com', '@oneword',
                  'hi @nam-e and @name', '@first @last', 'an @under_score',
@@ -327,3 +328,19 @@ def test_extract_puts_str_in_list():
 def test_extract_words_puts_str_in_list():
     word_summary_str = extract_words(word_posts, 'rain',  True)
     assert word_summary_str['top_words'][0][0] == 'rain'
+
+
+def test_extract_words_tokenized_corpus_entire_words():
+    corpus_summary = extract_words(TokenizedCorpus(word_posts),
+                                   ['rain', 'snow'], True)
+    assert corpus_summary['words'][:-1] == word_summary_full['words'][:-1]
+    # whole tokens only, '@rain' and '#snow' are different words
+    assert corpus_summary['words'][-1] == ['rain']
+
+
+def test_extract_words_tokenized_corpus_partial_words():
+    corpus_summary = extract_words(TokenizedCorpus(word_posts),
+                                   ['rain', 'snow'], False)
+    assert (corpus_summary['word_counts'] ==
+            word_summary_not_full['word_counts'])
+    assert 'training' in corpus_summary['words_flat']
@@ -1,9 +1,11 @@
+import tracemalloc
 import unittest
 from itertools import permutations, combinations
 
 from advertools.kw_generate import *
 
 import pandas as pd
+import pytest
 
 
 class KeywordTests(unittest.TestCase):
@@ -168,5 +170,116 @@ def test_kw_neg_phrase():
                       '-"seven eight nine"']
 
 
+def test_kw_generate_count_matches_kw_generate():
+    for order_matters in [True, False]:
+        for max_len in [2, 3, 4]:
+            products = ['one', 'two']
+            words = ['three', 'four', 'five']
+            df = kw_generate(products, words, max_len=max_len,
+                             order_matters=order_matters)
+            count = kw_generate_count(products, words, max_len=max_len,
+                                      order_matters=order_matters)
+            assert count == len(df)
+
+
+def test_product_in_words_same_as_filtering():
+    products = ['one']
+    words = ['one', 'two', 'three']
+    for order_matters in [True, False]:
+        comb_func = permutations if order_matters else combinations
+        expected = [' '.join(comb) for i in range(2, 4)
+                    for comb in comb_func(products + words, i)
+                    if 'one' in comb]
+        df = kw_generate(products, words, match_types=['Exact'],
+                         order_matters=order_matters)
+        assert df['Keyword'].tolist() == expected
+
+
+def test_keywords_in_permutations_order():
+    products = ['one', 'two']
+    words = ['three', 'four', 'five']
+    expected = [' '.join(perm) for prod in products for i in range(2, 5)
+                for perm in permutations([prod] + words, i) if prod in perm]
+    df = kw_generate(products, words, max_len=4, match_types=['Exact'])
+    assert df['Keyword'].tolist() == expected
+
+
+def test_kw_generate_chunks_same_as_kw_generate():
+    products = ['one', 'two']
+    words = ['three', 'four', 'five']
+    chunks = list(kw_generate_chunks(products, words, chunksize=10))
+    assert all(len(chunk) <= 10 for chunk in chunks)
+    assert pd.concat(chunks).equals(kw_generate(products, words))
+
+
+def test_kw_generate_chunks_streams_a_large_product():
+    words = ['word' + str(i) for i in range(25)]
+    tracemalloc.start()
+    num_rows = 0
+    for chunk in kw_generate_chunks(['product'], words, max_len=4,
+                                    chunksize=5000):
+        assert len(chunk) <= 5000
+        num_rows += len(chunk)
+        del chunk
+    chunks_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    tracemalloc.start()
+    df = kw_generate(['product'], words, max_len=4)
+    full_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert num_rows == len(df) == kw_generate_count(['product'], words,
+                                                    max_len=4)
+    assert chunks_peak < full_peak / 3
+
+
+def test_n_jobs_gives_same_result():
+    products = ['one', 'two', 'three']
+    words = ['four', 'five', 'six']
+    assert kw_generate(products, words, n_jobs=2).equals(
+        kw_generate(products, words))
+
+
+def test_compact_has_same_values():
+    products = ['one', 'two', 'One']
+    words = ['four', 'five', 'six']
+    df = kw_generate(products, words, match_types=['Exact', 'Modified'])
+    compact = kw_generate(products, words, match_types=['Exact', 'Modified'],
+                          compact=True)
+    for col in ['Campaign', 'Ad Group', 'Criterion Type', 'Labels']:
+        assert compact[col].dtype == 'category'
+    assert compact.astype(object).equals(df.astype(object))
+
+
+def test_kw_generate_to_file_csv(tmp_path):
+    path = str(tmp_path / 'keywords.csv')
+    num_rows = kw_generate_to_file(path, ['one', 'two'], ['three', 'four'],
+                                   chunksize=5)
+    df = kw_generate(['one', 'two'], ['three', 'four'])
+    assert num_rows == len(df)
+    assert pd.read_csv(path).equals(df)
+
+
+def test_kw_generate_to_file_raises_on_wrong_format():
+    with pytest.raises(ValueError):
+        kw_generate_to_file('keywords.xlsx', ['one'], ['two'],
+                            format='xlsx')
+
+
+def test_kw_all_match_types_same_as_kw_functions():
+    keywords = ['[learn guitar]', '"guitar courses"', '+guitar +tutor',
+                '-cheap guitar', 'guitar']
+    df = kw_all_match_types(keywords)
+    funcs = [kw_broad, kw_exact, kw_phrase, kw_modified, kw_neg_broad,
+             kw_neg_phrase, kw_neg_exact]
+    assert list(df.columns) == [f.__name__[3:] for f in funcs]
+    for func in funcs:
+        assert df[func.__name__[3:]].tolist() == func(keywords)
+
+
+def test_kw_all_match_types_keeps_series_index():
+    keywords = pd.Series(['one two', 'three'], index=[10, 20])
+    assert kw_all_match_types(keywords).index.tolist() == [10, 20]
+
+
 if __name__ == '__main__':
         unittest.main()
@@ -0,0 +1,79 @@
+from advertools.kw_generate import kw_generate
+from advertools.kw_match import kw_match, kw_neg_conflicts
+
+
+def test_neg_broad_any_order():
+    result = kw_neg_conflicts(['shoes running', 'running'], ['-running shoes'])
+    assert result['keyword'].tolist() == ['shoes running']
+    assert result['match_type'].tolist() == ['Broad']
+
+
+def test_neg_phrase_needs_adjacent_words_in_order():
+    keywords = ['buy running shoes', 'shoes running', 'running red shoes']
+    result = kw_neg_conflicts(keywords, ['-"running shoes"'])
+    assert result['keyword'].tolist() == ['buy running shoes']
+
+
+def test_neg_exact_needs_same_words():
+    keywords = ['[running shoes]', 'running shoes cheap', '+Running +Shoes']
+    result = kw_neg_conflicts(keywords, ['-[running shoes]'])
+    assert result['keyword'].tolist() == ['[running shoes]',
+                                          '+Running +Shoes']
+    assert set(result['match_type']) == {'Exact'}
+
+
+def test_no_conflicts_returns_empty_df():
+    result = kw_neg_conflicts(['one two'], ['-three', '-[one]'])
+    assert result.empty
+    assert list(result.columns) == ['keyword', 'negative', 'match_type']
+
+
+def test_same_as_pairwise_comparison():
+    keywords = kw_generate(['bmw', 'audi'], ['buy', 'used', 'cheap'])
+    keywords = keywords['Keyword'].tolist()
+    negatives = ['-cheap', '-used buy', '-"buy bmw"', '-[audi used]',
+                 '-"cheap used audi"', '-[bmw]']
+    expected = []
+    for kw in keywords:
+        kw_tokens = kw.replace('+', '').lower().split()
+        for neg in negatives:
+            neg_tokens = neg.strip('-[]"').split()
+            if neg.startswith('-['):
+                blocked = kw_tokens == neg_tokens
+            elif neg.startswith('-"'):
+                blocked = any(kw_tokens[i:i+len(neg_tokens)] == neg_tokens
+                              for i in range(len(kw_tokens)))
+            else:
+                blocked = set(neg_tokens) <= set(kw_tokens)
+            if blocked:
+                expected.append((kw, neg))
+    result = kw_neg_conflicts(keywords, negatives)
+    assert list(zip(result['keyword'], result['negative'])) == expected
+
+
+def test_kw_match_priority_exact_phrase_modified_broad():
+    keywords = ['shoes', '+running +shoes', '"running shoes"',
+                '[running shoes]']
+    result = kw_match(['running shoes', 'red running shoes',
+                       'shoes for running', 'red shoes', 'hats'], keywords)
+    assert result['match_type'].tolist() == ['Exact', 'Phrase', 'Modified',
+                                             'Broad', None]
+    assert result['keyword'].tolist() == ['[running shoes]',
+                                          '"running shoes"',
+                                          '+running +shoes', 'shoes', None]
+
+
+def test_kw_match_longer_keyword_wins():
+    result = kw_match(['buy red running shoes'],
+                      ['"shoes"', '"running shoes"', '"red running"'])
+    assert result['keyword'].tolist() == ['"running shoes"']
+
+
+def test_kw_match_kw_generate_df():
+    keywords = kw_generate(['bmw', 'audi'], ['used', 'cheap'], max_len=2)
+    result = kw_match(['used bmw', 'BMW used', 'used red audi', 'kia',
+                       'used bmw'], keywords)
+    assert result['match_type'].tolist() == ['Exact', 'Exact', 'Modified',
+                                             None, 'Exact']
+    assert result['ad_group'].tolist() == ['Bmw', 'Bmw', 'Audi', None, 'Bmw']
+    assert result['search_term'].tolist()[-1] == 'used bmw'
@@ -1,15 +1,24 @@
+import gc
+import json
 import logging
 import os
+import threading
+import time
+import weakref
 from itertools import product
 
 import pandas as pd
 import pytest
 
-from advertools.serp import (serp_goog, serp_youtube, SERP_GOOG_VALID_VALS,
+from advertools.serp import (serp_goog, serp_goog_iter, serp_youtube,
+                             SERP_GOOG_VALID_VALS,
                              SERP_YTUBE_VALID_VALS, youtube_channel_details,
                              youtube_video_details, YOUTUBE_VID_CATEGORY_IDS,
                              YOUTUBE_TOPIC_IDS, _dict_product,
-                             set_logging_level)
+                             _iter_responses,
+                             serp_rate_limit_stats, set_logging_level,
+                             set_max_in_flight_per_key, set_serp_rate_limit,
+                             set_serp_session)
 
 goog_cse_cx = os.environ.get('GOOG_CSE_CX')
 goog_cse_key = os.environ.get('GOOG_CSE_KEY')
@@ -51,6 +60,339 @@ def test_dict_product_return_correct_types():
     assert len(dp) == len(list(product(*d.values())))
 
 
+class FakeResponse:
+    """Stands in for ``requests.Response``, with a Custom Search API body
+    echoing the query."""
+
+    def __init__(self, params, status_code=200):
+        self.status_code = status_code
+        self.params = params
+
+    @property
+    def content(self):
+        return json.dumps(self.json()).encode()
+
+    def json(self):
+        if self.status_code >= 400:
+            return {'error': {'code': self.status_code}}
+        q = self.params['q']
+        request = {k: v for k, v in self.params.items() if k not in
+                   ('q', 'key')}
+        request.update(title='x', searchTerms=q, startIndex=1)
+        return {
+            'queries': {'request': [request]},
+            'searchInformation': {'totalResults': '2',
+                                  'searchTime': 0.1},
+            'context': {'title': 'cse'},
+            'items': [{'title': q + ' title ' + str(i),
+                       'link': 'https://example.com/' + q + str(i),
+                       'snippet': 'snippet', 'displayLink': 'example.com',
+                       **({'pagemap': {'metatags': [{'og:title': q}]}}
+                          if i == 0 else {})}
+                      for i in range(2)],
+        }
+
+
+class FakeSession:
+    """Stands in for ``requests.Session``, recording the params of each
+    request and the maximum number of concurrent requests."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.params = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def get(self, url, params=None, **kwargs):
+        with self.lock:
+            self.params.append(dict(params))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay * (hash(params['q']) % 3))
+        with self.lock:
+            self.in_flight -= 1
+        return FakeResponse(params)
+
+
+def test_serp_goog_concurrent_keeps_order():
+    session = FakeSession(delay=0.01)
+    queries = ['q' + str(i) for i in range(12)]
+    result = serp_goog(q=queries, cx='cx', key='key', max_workers=4,
+                       session=session)
+    assert result['searchTerms'].drop_duplicates().tolist() == queries
+    assert all('max_workers' not in p and 'session' not in p
+               for p in session.params)
+    sequential = serp_goog(q=queries, cx='cx', key='key', session=session)
+    assert (result.drop('queryTime', axis=1)
+            .equals(sequential.drop('queryTime', axis=1)))
+
+
+def test_max_in_flight_per_key():
+    session = FakeSession(delay=0.02)
+    set_max_in_flight_per_key(2)
+    try:
+        serp_goog(q=['q' + str(i) for i in range(10)], cx='cx', key='key',
+                  max_workers=8, session=session)
+    finally:
+        set_max_in_flight_per_key(10)
+    assert session.max_in_flight <= 2
+    with pytest.raises(ValueError):
+        set_max_in_flight_per_key(0)
+
+
+def test_set_serp_session_used_by_default():
+    session = FakeSession()
+    set_serp_session(session)
+    try:
+        serp_goog(q=['one', 'two'], cx='cx', key='key')
+    finally:
+        set_serp_session()
+    assert [p['q'] for p in session.params] == ['one', 'two']
+
+
+def test_serp_goog_expands_pagemap_and_metatags():
+    result = serp_goog(q=['one', 'two'], cx='cx', key='key',
+                       session=FakeSession())
+    assert result['og:title'].fillna('').tolist() == ['one', '', 'two', '']
+    assert result['metatags'].notna().tolist() == [True, False, True, False]
+
+
+def test_serp_goog_cache_ignores_key_and_expires(tmp_path):
+    cache = str(tmp_path / 'serp_cache.sqlite')
+    session = FakeSession()
+    first = serp_goog(q=['one', 'two'], cx='cx', key='key1', cache=cache,
+                      session=session)
+    second = serp_goog(q=['one', 'two'], cx='cx', key='key2', cache=cache,
+                       session=session)
+    assert len(session.params) == 2
+    assert (first.drop('queryTime', axis=1)
+            .equals(second.drop('queryTime', axis=1)))
+    assert all('cache' not in p for p in session.params)
+    time.sleep(0.01)
+    serp_goog(q='one', cx='cx', key='key1', cache=cache, cache_ttl=0,
+              session=session)
+    assert len(session.params) == 3
+
+
+def test_serp_goog_parses_each_response_once(monkeypatch):
+    import advertools.serp
+    calls = []
+
+    def counting_loads(content):
+        calls.append(content)
+        return json.loads(content.decode('utf-8'))
+
+    monkeypatch.setattr(advertools.serp, '_json_loads', counting_loads)
+    result = serp_goog(q=['one', 'two', 'three'], cx='cx', key='key',
+                       session=FakeSession())
+    assert len(calls) == 3
+    assert result['searchTerms'].drop_duplicates().tolist() == ['one', 'two',
+                                                                'three']
+
+
+def test_serp_goog_iter_yields_frame_per_request():
+    session = FakeSession()
+    received = []
+    frames = serp_goog_iter(q=['one', 'two'], gl=['us', 'fr'], cx='cx',
+                            key='key', session=session,
+                            on_result=received.append)
+    assert session.params == []
+    first = next(frames)
+    assert len(session.params) == 1
+    assert first['searchTerms'].tolist() == ['one', 'one']
+    assert first['og:title'].fillna('').tolist() == ['one', '']
+    frames = [first] + list(frames)
+    assert len(frames) == 4 and received == frames
+    combined = pd.concat(frames, sort=False, ignore_index=True)
+    expected = serp_goog(q=['one', 'two'], gl=['us', 'fr'], cx='cx',
+                         key='key', session=session)
+    assert (combined[expected.columns].drop('queryTime', axis=1)
+            .equals(expected.drop('queryTime', axis=1)))
+
+
+def test_serp_goog_iter_concurrent_and_validates_on_call():
+    queries = ['q' + str(i) for i in range(8)]
+    frames = serp_goog_iter(q=queries, cx='cx', key='key', max_workers=4,
+                            session=FakeSession(delay=0.01))
+    assert sorted(df['searchTerms'][0] for df in frames) == sorted(queries)
+    with pytest.raises(ValueError):
+        serp_goog_iter(q='q', cx='cx', key='key', gl='WRONG VALUE')
+
+
+class Body(dict):
+    """A parsed response that can be tracked with weak references."""
+
+
+def test_iter_responses_releases_yielded_responses(monkeypatch):
+    import advertools.serp
+    bodies = []
+
+    def tracking_loads(content):
+        body = Body(json.loads(content.decode('utf-8')))
+        bodies.append(weakref.ref(body))
+        return body
+
+    monkeypatch.setattr(advertools.serp, '_json_loads', tracking_loads)
+    params_list = [{'q': 'q' + str(i), 'cx': 'cx', 'key': 'key'}
+                   for i in range(40)]
+    for max_workers, max_alive in [(None, 1), (4, 8)]:
+        bodies.clear()
+        responses = _iter_responses('url', params_list, max_workers,
+                                    session=FakeSession(delay=0.001))
+        alive = []
+        for param, resp in responses:
+            del param, resp
+            gc.collect()
+            alive.append(sum(ref() is not None for ref in bodies))
+        assert len(bodies) == 40
+        assert max(alive) <= max_alive
+        gc.collect()
+        assert not any(ref() is not None for ref in bodies)
+
+
+class FailingSession(FakeSession):
+    """A ``FakeSession`` that returns ``status_code`` for the query
+    ``fail_q``, the first ``times`` times it's requested."""
+
+    def __init__(self, fail_q, status_code=400, times=None):
+        super().__init__()
+        self.fail_q = fail_q
+        self.status_code = status_code
+        self.times = times
+
+    def get(self, url, params=None, **kwargs):
+        resp = super().get(url, params, **kwargs)
+        if params['q'] == self.fail_q and self.times != 0:
+            resp.status_code = self.status_code
+            if self.times is not None:
+                self.times -= 1
+        return resp
+
+
+def test_serp_goog_job_dir_resumes_missing_requests(tmp_path):
+    job_dir = str(tmp_path / 'job')
+    queries = ['q' + str(i) for i in range(5)]
+    failing = FailingSession(fail_q='q3')
+    with pytest.raises(Exception):
+        serp_goog(q=queries, cx='cx', key='key1', job_dir=job_dir,
+                  session=failing)
+    assert len(failing.params) == 4
+    assert len([f for f in os.listdir(job_dir) if f.endswith('.gz')]) == 3
+    with open(os.path.join(job_dir, 'manifest.jsonl'), 'a') as manifest:
+        manifest.write('{"key": "torn')
+    session = FakeSession()
+    result = serp_goog(q=queries, cx='cx', key='key2', job_dir=job_dir,
+                       session=session)
+    assert [p['q'] for p in session.params] == ['q3', 'q4']
+    expected = serp_goog(q=queries, cx='cx', key='key', session=session)
+    assert (result.drop('queryTime', axis=1)
+            .equals(expected.drop('queryTime', axis=1)))
+    again = serp_goog(q=queries, cx='cx', key='key2', job_dir=job_dir,
+                      session=session)
+    assert len(session.params) == 7
+    assert again.equals(result)
+
+
+def test_serp_goog_job_dir_releases_saved_responses(tmp_path, monkeypatch):
+    import advertools.serp
+    bodies = []
+    alive = []
+    job_save = advertools.serp._job_save
+
+    def tracking_loads(content):
+        body = Body(json.loads(content.decode('utf-8')))
+        bodies.append(weakref.ref(body))
+        return body
+
+    def tracking_save(*args):
+        filename = job_save(*args)
+        gc.collect()
+        alive.append(sum(ref() is not None for ref in bodies))
+        return filename
+
+    monkeypatch.setattr(advertools.serp, '_json_loads', tracking_loads)
+    monkeypatch.setattr(advertools.serp, '_job_save', tracking_save)
+    queries = ['q' + str(i) for i in range(40)]
+    result = serp_goog(q=queries, cx='cx', key='key',
+                       job_dir=str(tmp_path / 'job'), max_workers=4,
+                       session=FakeSession(delay=0.001))
+    assert len(alive) == 40 and max(alive) <= 9
+    assert result['searchTerms'].drop_duplicates().tolist() == queries
+
+
+def test_serp_goog_retries_with_backoff():
+    set_serp_rate_limit(max_retries=2, backoff=0.001)
+    serp_rate_limit_stats(reset=True)
+    try:
+        session = FailingSession(fail_q='two', status_code=503, times=2)
+        result = serp_goog(q=['one', 'two'], cx='cx', key='key',
+                           session=session)
+        assert result['searchTerms'].drop_duplicates().tolist() == ['one',
+                                                                    'two']
+        stats = serp_rate_limit_stats()
+        assert stats['requests'] == 4 and stats['retries'] == 2
+        assert 0 < stats['backoff_seconds'] < 0.01
+        with pytest.raises(Exception):
+            serp_goog(q='two', cx='cx', key='key',
+                      session=FailingSession(fail_q='two', status_code=503))
+        not_retried = FailingSession(fail_q='two', status_code=400)
+        with pytest.raises(Exception):
+            serp_goog(q='two', cx='cx', key='key', session=not_retried)
+        assert len(not_retried.params) == 1
+    finally:
+        set_serp_rate_limit()
+
+
+def test_serp_goog_retry_honours_retry_after(monkeypatch):
+    import advertools.serp
+    sleeps = []
+    monkeypatch.setattr(advertools.serp.time, 'sleep', sleeps.append)
+    session = FailingSession(fail_q='one', status_code=429, times=1)
+    original_get = session.get
+
+    def get_with_header(url, params=None, **kwargs):
+        resp = original_get(url, params, **kwargs)
+        resp.headers = {'Retry-After': '7'}
+        return resp
+
+    session.get = get_with_header
+    serp_goog(q='one', cx='cx', key='key', session=session)
+    assert [s for s in sleeps if s] == [7.0]
+
+
+def test_is_retryable_handles_unexpected_403_bodies():
+    import advertools.serp
+    is_retryable = advertools.serp._is_retryable
+    reason = {'error': {'errors': [{'reason': 'userRateLimitExceeded'}]}}
+    assert is_retryable(403, reason)
+    for body in [{'error': 'quota'}, {'error': {'errors': 'x'}},
+                 {'error': {'errors': ['x']}}, b'<html>', None]:
+        assert not is_retryable(403, body)
+
+
+def test_serp_rate_limit_throttles_and_enforces_quota(monkeypatch):
+    import advertools.serp
+    sleeps = []
+    monkeypatch.setattr(advertools.serp.time, 'sleep', sleeps.append)
+    set_serp_rate_limit(queries_per_100s=2, daily_quota=5)
+    serp_rate_limit_stats(reset=True)
+    try:
+        serp_goog(q=['q1', 'q2', 'q3', 'q4'], cx='cx', key='key',
+                  session=FakeSession())
+        assert [round(s) for s in sleeps if s] == [50, 100]
+        assert round(serp_rate_limit_stats()['throttled_seconds']) == 150
+        serp_goog(q='q1', cx='cx', key='other_key', session=FakeSession())
+        assert len([s for s in sleeps if s]) == 2
+        with pytest.raises(Exception):
+            serp_goog(q=['q5', 'q6'], cx='cx', key='key',
+                      session=FakeSession())
+        with pytest.raises(ValueError):
+            set_serp_rate_limit(queries_per_100s=0)
+    finally:
+        set_serp_rate_limit()
+
+
 # Google search tests:
 def test_serp_goog_raises_error_on_invalid_args():
     with pytest.raises(ValueError):
@@ -1,7 +1,9 @@
 from urllib.parse import urlparse, parse_qs
 
+import pandas as pd
 import pytest
-from advertools.url_builders import url_utm_ga
+from advertools.url_builders import (url_utm_ga, url_utm_ga_batch,
+                                     url_utm_parse)
 
 
 def test_correct_url_returned():
@@ -31,3 +33,77 @@ def test_space_converted_to_plut():
 def test_symbols_are_url_encoded():
     result = url_utm_ga('www.mysite.com', 'one !@#$%^&*() two')
     assert result == 'www.mysite.com?utm_source=one+%21%40%23%24%25%5E%26%2A%28%29+two'
+
+
+def test_batch_same_as_url_utm_ga():
+    urls = ['www.mysite.com', 'www.mysite.com/a', 'www.mysite.com']
+    sources = ['one two', 'one !@#$%^&*() two', 'three']
+    campaigns = ['c1', 'c2', 'c1']
+    result = url_utm_ga_batch(urls, sources, 'medium', campaigns,
+                              'content', 'term')
+    for url, source, campaign, batch_url in zip(urls, sources, campaigns,
+                                                result):
+        single_url = url_utm_ga(url, source, 'medium', campaign,
+                                'content', 'term')
+        assert (parse_qs(urlparse(batch_url).query) ==
+                parse_qs(urlparse(single_url).query))
+
+
+def test_batch_params_in_order_and_missing_skipped():
+    result = url_utm_ga_batch(['a.com', 'b.com'], ['s1', 's2'],
+                              utm_medium=[None, 'm2'], utm_term='t')
+    assert result.tolist() == ['a.com?utm_source=s1&utm_term=t',
+                               'b.com?utm_source=s2&utm_medium=m2&utm_term=t']
+
+
+def test_batch_existing_query_and_fragment():
+    urls = pd.Series(['a.com/?x=1', 'a.com/?', 'a.com/#top',
+                      'a.com/?x=1&#top'], index=[5, 6, 7, 8])
+    result = url_utm_ga_batch(urls, 'src')
+    assert result.index.tolist() == [5, 6, 7, 8]
+    assert result.tolist() == ['a.com/?x=1&utm_source=src',
+                               'a.com/?utm_source=src',
+                               'a.com/?utm_source=src#top',
+                               'a.com/?x=1&utm_source=src#top']
+
+
+def test_batch_no_params_leaves_url_unchanged():
+    result = url_utm_ga_batch(['a.com', 'b.com?x=1'], [None, ''])
+    assert result.tolist() == ['a.com', 'b.com?x=1']
+
+
+def test_batch_missing_urls_left_untouched():
+    result = url_utm_ga_batch(['a.com', None, 'b.com', float('nan')], 's')
+    assert result[[0, 2]].tolist() == ['a.com?utm_source=s',
+                                       'b.com?utm_source=s']
+    assert result[1] is None and pd.isna(result[3])
+
+
+def test_batch_falsy_values_skipped_as_in_url_utm_ga():
+    result = url_utm_ga_batch(['a.com'], 's', utm_medium=0,
+                              utm_campaign=[0])
+    assert result.tolist() == [url_utm_ga('a.com', 's', utm_medium=0,
+                                          utm_campaign=0)]
+
+
+def test_parse_inverse_of_url_utm_ga():
+    url = url_utm_ga('www.mysite.com', 'one !@#$%^&*() two', 'medium',
+                     'campaign', 'content', 'term')
+    result = url_utm_parse([url])
+    assert result.iloc[0].tolist() == [url, 'one !@#$%^&*() two', 'medium',
+                                       'campaign', 'content', 'term']
+
+
+def test_parse_same_as_parse_qs():
+    urls = pd.Series(['a.com?utm_source=s&x=1&utm_source=t#frag',
+                      'a.com?utm_source=&utm_term=a+b', 'a.com', None,
+                      'a.com?utm_source=s&x=1&utm_source=t#frag'],
+                     index=list('abcde'))
+    result = url_utm_parse(urls)
+    assert result.index.tolist() == list('abcde')
+    for url, (_, row) in zip(urls, result.iterrows()):
+        query = parse_qs(urlparse(url).query) if url else {}
+        for param in ['utm_source', 'utm_medium', 'utm_term']:
+            expected = query.get(param, [None])[0]
+            assert (row[param] if pd.notna(row[param]) else None) == expected
+    assert str(result['utm_source'].dtype) == 'category'
@@ -1,4 +1,7 @@
-from advertools.word_frequency import word_frequency
+import pytest
+
+from advertools.word_frequency import word_frequency, word_frequency_external
+from advertools.word_tokenize import TokenizedCorpus
 
 
 text_list = [
@@ -55,3 +58,127 @@ def test_works_without_numlist_provided():
 def test_word_freq_uses_regex():
     result = word_frequency(['pizza burger', 'pizza sandwitch'], regex='pizza')
     assert result['word'][0] == 'pizza'
+
+
+def test_regex_tokens_same_as_tokenizing_single_word_matches():
+    texts = ['Apple, orange! (banana) apple', 'KIWI mango; kiwi...',
+             'orange-juice and $1,000 apples']
+    nums = [10, 20, 30]
+    for phrase_len in [1, 2]:
+        for regex in ['[a-zA-Z]+', '[a-z]+', 'apple|kiwi']:
+            tokenized = word_frequency(texts, nums, phrase_len, regex=regex,
+                                       rm_words=[])
+            tokens = word_frequency(texts, nums, phrase_len, regex=regex,
+                                    rm_words=[], regex_tokens=True)
+            assert tokens.equals(tokenized)
+            external = word_frequency_external(texts, nums, phrase_len,
+                                               regex=regex, rm_words=[],
+                                               regex_tokens=True)
+            assert (external.sort_values('word', ignore_index=True)
+                    .equals(tokens.sort_values('word', ignore_index=True)))
+
+
+def test_regex_tokens_counts_matches_as_they_are():
+    result = word_frequency(['New York, new york.'], regex='new york',
+                            rm_words=[], regex_tokens=True)
+    assert result['word'].tolist() == ['new york']
+    assert result['abs_freq'].tolist() == [1]
+
+
+def test_approximate_has_same_columns():
+    exact = word_frequency(text_list, num_list, extra_info=True)
+    approx = word_frequency(text_list, num_list, extra_info=True,
+                            approximate=True)
+    assert list(approx.columns) == list(exact.columns)
+
+
+def test_approximate_returns_top_n():
+    result = word_frequency(text_list, num_list, approximate=True, top_n=2)
+    assert len(result) == 2
+    assert result['wtd_freq'].is_monotonic_decreasing
+
+
+def test_approximate_never_underestimates():
+    exact = word_frequency(text_list, num_list).set_index('word')
+    approx = word_frequency(text_list, num_list,
+                            approximate=True).set_index('word')
+    assert (approx['abs_freq'] >=
+            exact.loc[approx.index, 'abs_freq']).all()
+    assert (approx['wtd_freq'] >=
+            exact.loc[approx.index, 'wtd_freq']).all()
+    assert approx['abs_freq'].dtype == exact['abs_freq'].dtype == 'int64'
+    assert approx['wtd_freq'].dtype == exact['wtd_freq'].dtype == 'int64'
+
+
+def test_approximate_keeps_heavy_rare_phrases():
+    texts = ['whale'] + ['w' + str(i) for i in range(50)] * 3
+    result = word_frequency(texts, [1e6] + [1] * 150, approximate=True,
+                            top_n=3, error=0.05)
+    assert result['word'][0] == 'whale'
+    assert (result['wtd_freq'] >= result['abs_freq']).all()
+    assert result['wtd_freq'].dtype == 'float64'
+
+
+def test_approximate_raises_on_wrong_error_or_confidence():
+    for kwargs in [{'error': 0}, {'error': 1}, {'confidence': 0},
+                   {'confidence': 1.5}]:
+        with pytest.raises(ValueError):
+            word_frequency(text_list, approximate=True, **kwargs)
+
+
+def test_tokenized_corpus_gives_same_result():
+    corpus = TokenizedCorpus(text_list)
+    for phrase_len in [1, 2, 3]:
+        for nums in [None, num_list]:
+            for rm_words in [['one', 'two five'], ['four five'], []]:
+                expected = word_frequency(text_list, nums, phrase_len,
+                                          rm_words=rm_words)
+                result = word_frequency(corpus, nums, phrase_len,
+                                        rm_words=rm_words)
+                assert result.equals(expected)
+
+
+def test_tokenized_corpus_num_list_iterable_and_length():
+    corpus = TokenizedCorpus(text_list)
+    result = word_frequency(corpus, (n for n in num_list))
+    assert result.equals(word_frequency(text_list, num_list))
+    for nums in [num_list[:2], num_list + [5]]:
+        assert (word_frequency(corpus, nums)
+                .equals(word_frequency(text_list, nums)))
+
+
+def test_tokenized_corpus_raises_on_regex():
+    with pytest.raises(ValueError):
+        word_frequency(TokenizedCorpus(text_list), regex='one')
+
+
+def test_external_same_as_word_frequency():
+    for max_phrases in [1, 2, 1000]:
+        expected = word_frequency(text_list, num_list, phrase_len=2,
+                                  rm_words=[])
+        result = word_frequency_external(text_list, num_list, phrase_len=2,
+                                         rm_words=[], max_phrases=max_phrases,
+                                         max_runs=2)
+        assert (result.sort_values('word').reset_index(drop=True)
+                .equals(expected.sort_values('word')
+                        .reset_index(drop=True)))
+
+
+def test_external_raises_on_wrong_max_runs_or_max_phrases():
+    for kwargs in [{'max_runs': 1}, {'max_runs': 0}, {'max_phrases': 0}]:
+        with pytest.raises(ValueError):
+            word_frequency_external(text_list, num_list, **kwargs)
+
+
+def test_external_streams_to_parquet(tmp_path):
+    pytest.importorskip('pyarrow')
+    import pandas as pd
+    output_file = str(tmp_path / 'words.parquet')
+    stats = word_frequency_external(iter(text_list), iter(num_list),
+                                    max_phrases=2, output_file=output_file)
+    assert stats['spills'] > 0
+    result = pd.read_parquet(output_file)
+    expected = word_frequency(text_list, num_list)
+    assert stats['distinct_phrases'] == len(result) == len(expected)
+    assert result['word'].is_monotonic_increasing
+    assert set(result['word']) == set(expected['word'])
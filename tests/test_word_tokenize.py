@@ -1,4 +1,5 @@
-from advertools.word_tokenize import word_tokenize
+from advertools.regex import WORD_DELIM
+from advertools.word_tokenize import TokenizedCorpus, word_tokenize
 
 
 def test_word_tokenize_splits_by_correct_number():
@@ -12,3 +13,29 @@ def test_word_tokenize_converts_str_to_list():
     s = 'this is a normal string'
     result = word_tokenize(s)
     assert isinstance(result, list)
+
+
+def test_word_tokenize_same_as_split_and_strip():
+    s = ['"Quoted" words, (parens) and $1,000!', '!!! ...', '',
+         "  'don't'  stop\tme\nnow ", '[brackets] \\back\\slash\\']
+    expected = [[w.strip(WORD_DELIM) for w in text.lower().split()]
+                for text in s]
+    assert word_tokenize(s, 1) == expected
+
+
+def test_tokenized_corpus_phrases_same_as_word_tokenize():
+    s = ['this is a text to split', '', 'two words', '(another) text!']
+    corpus = TokenizedCorpus(s)
+    assert len(corpus) == len(s)
+    assert corpus.ids.dtype == 'int32'
+    for i in range(1, 4):
+        assert word_tokenize(corpus, i) == word_tokenize(s, i)
+
+
+def test_tokenized_corpus_ngrams_within_documents():
+    corpus = TokenizedCorpus(['one two', 'three', 'four five six'])
+    ngrams, doc_index = corpus.ngrams(2)
+    assert corpus.vocabulary[ngrams].tolist() == [['one', 'two'],
+                                                  ['four', 'five'],
+                                                  ['five', 'six']]
+    assert doc_index.tolist() == [0, 2, 2]